@@ -62,32 +62,38 @@ export default function ToolMonitor({
         onConnectionChange(true)
       }
 
+      const handleToolMessage = (data: any) => {
+        if (data.type === 'therapeutic_batch') {
+          // Commands coalesced by the backend within one flush window
+          data.items.forEach(handleToolMessage)
+        } else if (data.type === 'therapeutic_welcome') {
+          console.log('🏥 Welcome message received:', data.message)
+        } else if (data.type === 'therapeutic_clinical_log') {
+          // Handle clinical logs
+          onToolCall({
+            toolName: data.tool || 'clinical',
+            action: data.action || 'log',
+            status: 'completed',
+            result: data,
+            culturalContext: data.clinical_context
+          })
+        } else if (data.type === 'therapeutic_crisis_documentation') {
+          // Handle crisis documentation
+          onToolCall({
+            toolName: 'crisis_detection',
+            action: 'crisis_detected',
+            status: 'completed',
+            result: data,
+            culturalContext: data.data?.crisis_documentation?.cultural_considerations
+          })
+        }
+      }
+
       ws.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data)
           console.log('🏥 Therapeutic tool message:', data)
-          
-          if (data.type === 'therapeutic_welcome') {
-            console.log('🏥 Welcome message received:', data.message)
-          } else if (data.type === 'therapeutic_clinical_log') {
-            // Handle clinical logs
-            onToolCall({
-              toolName: data.tool || 'clinical',
-              action: data.action || 'log',
-              status: 'completed',
-              result: data,
-              culturalContext: data.clinical_context
-            })
-          } else if (data.type === 'therapeutic_crisis_documentation') {
-            // Handle crisis documentation
-            onToolCall({
-              toolName: 'crisis_detection',
-              action: 'crisis_detected',
-              status: 'completed',
-              result: data,
-              culturalContext: data.crisis_documentation?.cultural_considerations
-            })
-          }
+          handleToolMessage(data)
         } catch (error) {
           console.error('Error parsing therapeutic tool message:', error)
         }
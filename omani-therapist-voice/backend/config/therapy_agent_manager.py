@@ -3,7 +3,7 @@ Therapy Agent Manager for OMANI Therapist Voice.
 Manages different therapeutic agents with cultural sensitivity and clinical protocols.
 """
 
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from loguru import logger
 
 
@@ -536,6 +536,24 @@ class TherapyAgentManager:
             tools: List of tool definitions for the agent
             tool_instances: Dictionary of tool instances
         """
+        self._store_agent(agent_name, instructions, tools, tool_instances)
+        logger.info(f"🏥 Registered therapeutic agent: {agent_name}")
+    
+    def register_agents(self, agent_specs: List[Tuple[str, str, List[Dict], Dict[str, Any]]]):
+        """
+        Register several therapeutic agents in one pass.
+        
+        Args:
+            agent_specs: (agent_name, instructions, tools, tool_instances) tuples,
+                in the same order as register_agent's arguments
+        """
+        for agent_spec in agent_specs:
+            self._store_agent(*agent_spec)
+        
+        logger.info(f"🏥 Registered therapeutic agents: {', '.join(spec[0] for spec in agent_specs)}")
+    
+    def _store_agent(self, agent_name: str, instructions: str, tools: List[Dict], tool_instances: Dict[str, Any]):
+        """Store an agent's configuration in the manager's lookup tables."""
         self.agents[agent_name] = {
             "instructions": instructions,
             "tools": tools,
@@ -546,8 +564,6 @@ class TherapyAgentManager:
         
         self.agent_instructions[agent_name] = instructions
         self.agent_tools[agent_name] = tool_instances
-        
-        logger.info(f"🏥 Registered therapeutic agent: {agent_name}")
     
     def _get_agent_specialization(self, agent_name: str) -> str:
         """Get the specialization description for an agent."""
@@ -15,9 +15,9 @@ import os
 import sys
 import asyncio
 import json
-import time
+import re
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple
 from contextlib import asynccontextmanager
 
 import uvicorn
@@ -79,14 +79,64 @@ from pipecat.transports.network.fastapi_websocket import (
 
 load_dotenv(override=True)
 
+
+def get_log_level(env_var: str, default: str) -> str:
+    """Read a loguru level name from the environment, falling back to the default when it is unknown."""
+    level = os.getenv(env_var, default).strip().upper()
+    try:
+        logger.level(level)
+    except ValueError:
+        return default
+    return level
+
+
+LOG_LEVEL = get_log_level("LOG_LEVEL", "DEBUG")
+TRANSCRIPT_LOG_LEVEL = get_log_level("TRANSCRIPT_LOG_LEVEL", "INFO")
+
 logger.remove(0)
-logger.add(sys.stderr, level="DEBUG")
-logger.add("transcripts.log", level="INFO", rotation="10 MB", filter=lambda record: record["extra"].get("is_conversation", False))
+logger.add(sys.stderr, level=LOG_LEVEL)
+logger.add("transcripts.log", level=TRANSCRIPT_LOG_LEVEL, rotation="10 MB", filter=lambda record: record["extra"].get("is_conversation", False))
+
+# Transcript lines are logged at INFO; skip building them when no sink would accept that level
+TRANSCRIPT_LOGGING_ENABLED = min(logger.level(LOG_LEVEL).no, logger.level(TRANSCRIPT_LOG_LEVEL).no) <= logger.level("INFO").no
+TRANSCRIPT_ROLES = frozenset(("user", "model", "assistant"))
 
 # Default to general therapy agent
 SYSTEM_INSTRUCTION = GENERAL_THERAPY_INSTRUCTION
 
 
+# Therapeutic agents as (name, instructions, tool names); None means every tool
+THERAPY_AGENTS = (
+    ("general_therapy", GENERAL_THERAPY_INSTRUCTION, None),
+    ("crisis_intervention", CRISIS_INTERVENTION_INSTRUCTION, ("crisis_detection", "session_management")),
+    ("cbt_specialist", CBT_SPECIALIST_INSTRUCTION, ("cbt_techniques", "emotional_analysis")),
+)
+
+
+class MockFunctionCall(NamedTuple):
+    """Function call shape expected by TherapyAgentManager.handle_function_call."""
+    name: str
+    arguments: Dict[str, Any]
+
+
+# Placeholder fragments that mark an API key as not configured, compiled once into
+# a single alternation so each key is scanned in one pass
+def _compile_placeholder_pattern(placeholders: List[str]) -> re.Pattern:
+    return re.compile("|".join(re.escape(placeholder) for placeholder in placeholders))
+
+
+GOOGLE_KEY_PLACEHOLDER_PATTERN = _compile_placeholder_pattern([
+    "your_", "ai...", "your-", "example", "placeholder", "here", "key_here"
+])
+OPENAI_KEY_PLACEHOLDER_PATTERN = _compile_placeholder_pattern([
+    "your_", "sk-your_", "your-", "sk-...", "example", "placeholder", "here", "key_here"
+])
+API_KEY_PLACEHOLDER_PATTERN = _compile_placeholder_pattern([
+    "your_", "sk-your_", "your-", "ai...", "sk-...",
+    "example", "placeholder", "here", "key_here"
+])
+
+
 # Removed complex transport error handler - using simpler approach
 
 
@@ -144,11 +194,8 @@ def is_valid_google_api_key(key):
     if not key:
         return False
     
-    placeholders = ["your_", "ai...", "your-", "example", "placeholder", "here", "key_here"]
-    key_lower = key.lower()
-    for placeholder in placeholders:
-        if placeholder in key_lower:
-            return False
+    if GOOGLE_KEY_PLACEHOLDER_PATTERN.search(key.lower()):
+        return False
     
     if not key.startswith("AI"):
         return False
@@ -161,11 +208,8 @@ def is_valid_openai_api_key(key):
     if not key:
         return False
     
-    placeholders = ["your_", "sk-your_", "your-", "sk-...", "example", "placeholder", "here", "key_here"]
-    key_lower = key.lower()
-    for placeholder in placeholders:
-        if placeholder in key_lower:
-            return False
+    if OPENAI_KEY_PLACEHOLDER_PATTERN.search(key.lower()):
+        return False
     
     if not key.startswith("sk-"):
         return False
@@ -179,15 +223,8 @@ def is_valid_api_key(key, key_type):
         return False
     
     # Check for common placeholder patterns
-    placeholders = [
-        "your_", "sk-your_", "your-", "ai...", "sk-...", 
-        "example", "placeholder", "here", "key_here"
-    ]
-    
-    key_lower = key.lower()
-    for placeholder in placeholders:
-        if placeholder in key_lower:
-            return False
+    if API_KEY_PLACEHOLDER_PATTERN.search(key.lower()):
+        return False
     
     # Basic format validation
     if key_type == "openai" and not key.startswith("sk-"):
@@ -554,10 +591,6 @@ async def run_therapy_bot(websocket: WebSocket):
         # Register therapeutic function handlers
         async def handle_therapy_function_call(params):
             try:
-                class MockFunctionCall:
-                    def __init__(self, name, arguments):
-                        self.name = name
-                        self.arguments = arguments
                 mock_call = MockFunctionCall(params.function_name, params.arguments)
                 result = await therapy_agent_manager_instance.handle_function_call(mock_call)
                 await params.result_callback({"result": result})
@@ -637,36 +670,24 @@ async def run_therapy_bot(websocket: WebSocket):
     
     therapy_agent_manager_instance.llm_recreate_callback = recreate_therapy_llm_callback
     
-    # Register therapeutic agents
-    therapy_agent_manager_instance.register_agent(
-        "general_therapy", 
-        GENERAL_THERAPY_INSTRUCTION,
-        [t.get_tool_definition() for t in tool_instances.values()],
-        tool_instances
-    )
+    # Build each tool definition once and share it across the agents that use it
+    tool_definitions = {name: tool.get_tool_definition() for name, tool in tool_instances.items()}
     
-    therapy_agent_manager_instance.register_agent(
-        "crisis_intervention",
-        CRISIS_INTERVENTION_INSTRUCTION,
-        [tool_instances["crisis_detection"].get_tool_definition(), tool_instances["session_management"].get_tool_definition()],
-        {"crisis_detection": tool_instances["crisis_detection"], "session_management": tool_instances["session_management"]}
-    )
-    
-    therapy_agent_manager_instance.register_agent(
-        "cbt_specialist",
-        CBT_SPECIALIST_INSTRUCTION,
-        [tool_instances["cbt_techniques"].get_tool_definition(), tool_instances["emotional_analysis"].get_tool_definition()],
-        {"cbt_techniques": tool_instances["cbt_techniques"], "emotional_analysis": tool_instances["emotional_analysis"]}
-    )
+    # Register therapeutic agents
+    agent_specs = []
+    for agent_name, instructions, agent_tool_names in THERAPY_AGENTS:
+        tool_names = agent_tool_names or tuple(tool_instances)
+        agent_specs.append((
+            agent_name,
+            instructions,
+            [tool_definitions[name] for name in tool_names],
+            {name: tool_instances[name] for name in tool_names}
+        ))
+    therapy_agent_manager_instance.register_agents(agent_specs)
     
     # Register therapeutic function handlers
     async def handle_therapy_function_call(params: FunctionCallParams):
         try:
-            class MockFunctionCall:
-                def __init__(self, name, arguments):
-                    self.name = name
-                    self.arguments = arguments
-            
             mock_call = MockFunctionCall(params.function_name, params.arguments)
             result = await therapy_agent_manager.handle_function_call(mock_call)
             await params.result_callback({"result": result})
@@ -700,11 +721,15 @@ async def run_therapy_bot(websocket: WebSocket):
     # Add transcript relay to frontend
     @transcript.event_handler("on_transcript_update")
     async def on_transcript_update(processor, frame):
+        if not TRANSCRIPT_LOGGING_ENABLED:
+            return
+        
         # Log only conversational messages (user and therapist/assistant) to transcripts.log
         for msg in frame.messages:
-            if hasattr(msg, 'role') and hasattr(msg, 'content'):
-                if msg.role in ("user", "model", "assistant") and msg.content:
-                    logger.bind(is_conversation=True).info(f"{msg.role}: {msg.content}")
+            role = getattr(msg, 'role', None)
+            content = getattr(msg, 'content', None)
+            if role in TRANSCRIPT_ROLES and content:
+                logger.bind(is_conversation=True).info(f"{role}: {content}")
     
     # Run the therapeutic pipeline
     runner = PipelineRunner(handle_sigint=False)
@@ -731,13 +756,15 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Configure CORS
+# Configure CORS for the known frontend origins only
+ALLOWED_ORIGINS = [origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3001,http://localhost:3000").split(",") if origin.strip()]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
 )
 
 # Import tool WebSocket registry
@@ -746,6 +773,18 @@ from utils.tool_websocket_registry import tool_websockets
 # Global therapy agent manager for WebSocket access
 therapy_agent_manager = None
 
+# Welcome message is identical for every tool client apart from client_id, so it is
+# serialized once and the id is spliced in before the closing brace
+WELCOME_MESSAGE_PREFIX = json.dumps({
+    "type": "therapeutic_welcome",
+    "message": "أهلاً وسهلاً! Welcome to OMANI Therapist Voice tool interface",
+    "available_commands": [
+        "get_agent_status", "switch_agent", "get_tools", "check_crisis_status",
+        "update_cultural_context", "get_session_info"
+    ],
+    "cultural_features": ["omani_arabic", "islamic_integration", "gulf_family_dynamics"]
+})[:-1] + ', "client_id": '
+
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -777,17 +816,7 @@ async def tools_websocket_endpoint(websocket: WebSocket):
     
     try:
         # Send welcome message with available commands
-        welcome_message = {
-            "type": "therapeutic_welcome",
-            "message": "أهلاً وسهلاً! Welcome to OMANI Therapist Voice tool interface",
-            "available_commands": [
-                "get_agent_status", "switch_agent", "get_tools", "check_crisis_status",
-                "update_cultural_context", "get_session_info"
-            ],
-            "cultural_features": ["omani_arabic", "islamic_integration", "gulf_family_dynamics"],
-            "client_id": client_id
-        }
-        await websocket.send_json(welcome_message)
+        await websocket.send_text(f'{WELCOME_MESSAGE_PREFIX}"{client_id}"}}')
         
         while True:
             # Listen for JSON commands
@@ -1116,11 +1145,16 @@ async def test_fallback_endpoint():
 @app.get("/session/documentation")
 async def get_session_documentation():
     """Get comprehensive session documentation for clinical records."""
+    return build_session_documentation(datetime.now())
+
+
+def build_session_documentation(now: datetime) -> Dict[str, Any]:
+    """Build session documentation stamped with a single captured time."""
     documentation = {
         "session_overview": {
             "service": "OMANI Therapist Voice",
-            "session_id": f"session_{int(time.time())}",
-            "timestamp": datetime.now().isoformat(),
+            "session_id": f"session_{int(now.timestamp())}",
+            "timestamp": now.isoformat(),
             "cultural_context": "omani_gulf_arabic_islamic",
             "therapeutic_approach": "culturally_integrated_ai_therapy"
         },
@@ -1142,9 +1176,7 @@ async def get_session_documentation():
         documentation["agent_history"] = therapy_agent_manager.get_agent_history()
     
     # Get tool documentation
-    for tool_name, tool_instance in global_tool_registry._active_tools.items():
-        if hasattr(tool_instance, 'get_session_documentation'):
-            documentation["tool_documentation"][tool_name] = tool_instance.get_session_documentation()
+    documentation["tool_documentation"] = global_tool_registry.get_all_session_documentation()
     
     # Get overall clinical summary
     documentation["clinical_summary"] = global_tool_registry.get_all_clinical_data()
@@ -1159,7 +1191,7 @@ async def export_session_data(request: Request):
     body = await request.json()
     export_format = body.get("format", "json")  # json, pdf, clinical_notes
     
-    documentation = await get_session_documentation()
+    documentation = build_session_documentation(datetime.now())
     
     if export_format == "json":
         return documentation
@@ -1237,4 +1269,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main())
@@ -4,10 +4,179 @@ Provides clinical safety, cultural sensitivity, and standardized interfaces.
 """
 
 import json
+import re
+from collections import deque
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 from loguru import logger
 from pipecat.adapters.schemas.function_schema import FunctionSchema
+from utils.tool_websocket_registry import broadcast_therapeutic_command_now, queue_therapeutic_broadcast
+
+# Rust-backed Aho-Corasick matcher for keyword scans (optional); the other tools import
+# AhoCorasick and AHOCORASICK_AVAILABLE from here and fall back to regex scans without it
+try:
+    from ahocorasick_rs import AhoCorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AhoCorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+
+# Crisis keywords checked against every user utterance (English, Arabic, Gulf dialect)
+CRISIS_KEYWORDS = (
+    # English direct indicators
+    "suicide", "kill myself", "end it all", "no point living", "hurt myself",
+    "overdose", "jump", "cut myself", "die", "death", "can't go on",
+    "better off dead", "want to disappear", "end my life", "not worth living",
+    
+    # Arabic direct indicators (العربية المباشرة)
+    "انتحار", "اقتل نفسي", "لا يوجد امل", "اؤذي نفسي", "اموت", 
+    "جرعة زائدة", "اقفز", "اجرح نفسي", "لا استطيع المتابعة", "اريد ان اختفي",
+    "انهي حياتي", "لا استحق الحياة", "تعبت من الحياة", "ما فيه فايدة",
+    
+    # Gulf Arabic expressions of extreme distress
+    "خلاص تعبت", "ما عاد فيني", "انطفيت", "مليت من الحياة", 
+    "ودي اروح", "تعبت من كل شي", "ما اقدر اكمل", "خلاص كفيت",
+    "حياتي ما لها معنى", "مو قادر", "تعبان نفسياً مره",
+    
+    # Cultural expressions of hopelessness
+    "الله يا خذني", "ريحني يا رب", "تعبت يا رب", "ما عاد لي صبر",
+    "يا ليتني ما انولدت", "ودي الموت", "الموت ارحم",
+    
+    # Omani/Gulf cultural distress expressions
+    "ما عاد عندي امل", "خلاص انكسرت", "روحي تعبانة", "قلبي مات",
+    "ما اقدر احتمل", "مو قادر على شي", "نفسيتي خربت خلاص"
+)
+
+# Keywords written in Arabic script, classified once for clinical log context
+ARABIC_CRISIS_KEYWORDS = frozenset(
+    keyword for keyword in CRISIS_KEYWORDS
+    if any("\u0600" <= char <= "\u06FF" for char in keyword)
+)
+
+# Metadata attached to every clinical log entry; shared between entries, never mutated
+# (a plain dict rather than MappingProxyType so the logs stay JSON-serializable)
+SESSION_METADATA = {
+    "tool_version": "1.0.0",
+    "cultural_adaptations": "omani_gulf_arabic",
+    "therapeutic_approach": "culturally_integrated_therapy",
+    "safety_protocols_active": True
+}
+
+# Arabic openings used by format_response_culturally, keyed by emotional tone
+CULTURAL_RESPONSE_PREFIXES = {
+    "supportive": "الله يعطيك القوة، ",  # "May Allah give you strength"
+    "encouraging": "إن شاء الله كل شيء سيكون بخير، ",  # "God willing, everything will be fine"
+}
+DEFAULT_CULTURAL_RESPONSE_PREFIX = "أفهم مشاعرك، "  # "I understand your feelings"
+
+# Culturally sensitive terms, grouped so one pass reports which recommendations apply
+CULTURAL_SENSITIVITY_PATTERN = re.compile(
+    r"(?P<religious>haram|forbidden|sin)|(?P<cultural>family|marriage|honor)",
+    re.IGNORECASE
+)
+CULTURAL_SENSITIVITY_RECOMMENDATIONS = (
+    ("religious", "Consider religious context sensitivity"),
+    ("cultural", "Apply Gulf cultural context")
+)
+
+# Most recent clinical log entries kept per tool for session documentation
+CLINICAL_LOG_CAPACITY = 1024
+
+# Culturally sensitive referral message in Arabic and English
+REFERRAL_MESSAGE_TEMPLATE = (
+    "أعتقد أنه من المفيد لك التحدث مع معالج نفسي مختص. هذا أمر طبيعي وإيجابي.\n\n"
+    "I believe it would be beneficial for you to speak with a licensed mental health professional. "
+    "This is a normal and positive step.\n\n"
+    "السبب: {reason}\n"
+    "Reason: {reason}\n\n"
+    "يمكنني مساعدتك في العثور على معالج يفهم ثقافتنا العربية.\n"
+    "I can help you find a therapist who understands our Arab culture."
+)
+
+# Session recommendations added for each active safety flag
+CRISIS_RECOMMENDATIONS = (
+    "Continue crisis monitoring and safety assessment",
+    "Ensure 24-hour safety plan is in place",
+    "Consider family involvement per cultural preferences"
+)
+ESCALATION_RECOMMENDATIONS = (
+    "Immediate professional intervention required",
+    "Coordinate with local mental health services",
+    "Provide emergency contact information"
+)
+REFERRAL_RECOMMENDATIONS = (
+    "Schedule follow-up with licensed mental health professional",
+    "Provide culturally appropriate referral options",
+    "Ensure continuity of care documentation"
+)
+CULTURAL_RECOMMENDATIONS = (
+    "Maintain cultural sensitivity in all interventions",
+    "Respect Islamic values and Gulf Arab customs",
+    "Consider family dynamics in treatment planning"
+)
+
+# Protocol details attached to crisis documentation (shared, do not mutate)
+CRISIS_DOCUMENTATION = {
+    "protocol_activated": True,
+    "cultural_considerations": "gulf_arabic_islamic_context",
+    "family_notification_status": "pending_assessment",
+    "emergency_resources_provided": True,
+    "follow_up_required": True
+}
+
+# Clinical actions whose name contains any of these words also get crisis documentation
+CRISIS_ACTION_PATTERN = re.compile(r"crisis|emergency|risk|escalation", re.IGNORECASE)
+
+# Client commands that must reach clients immediately instead of being coalesced
+PRIORITY_CLIENT_COMMANDS = frozenset(("emergency_escalation", "emergency_activated", "crisis_documentation"))
+
+# Single automaton so each utterance is scanned once for all keywords; overlapping
+# matches let the lookup report the same keyword as the list-order fallback
+CRISIS_KEYWORD_MATCHER = (
+    AhoCorasick(list(CRISIS_KEYWORDS))
+    if AHOCORASICK_AVAILABLE else None
+)
+
+
+def find_crisis_keyword(text: str) -> Optional[str]:
+    """
+    Find a crisis keyword in lowercased text.
+    
+    Args:
+        text: Lowercased user input
+        
+    Returns:
+        The first matching keyword in CRISIS_KEYWORDS order, or None if no keyword is present
+    """
+    if CRISIS_KEYWORD_MATCHER is not None:
+        matches = CRISIS_KEYWORD_MATCHER.find_matches_as_indexes(text, overlapping=True)
+        return CRISIS_KEYWORDS[min(match[0] for match in matches)] if matches else None
+    
+    # str.__contains__ per keyword beats a regex alternation without the automaton
+    for keyword in CRISIS_KEYWORDS:
+        if keyword in text:
+            return keyword
+    return None
+
+
+def format_cultural_response(response: str, emotional_tone: str = "supportive") -> str:
+    """
+    Prefix a response with the Arabic expression for its emotional tone.
+    
+    Usable at import time to build canned responses once.
+    
+    Args:
+        response: Base response
+        emotional_tone: Desired emotional tone
+        
+    Returns:
+        Culturally formatted response
+    """
+    # Add appropriate Arabic greetings and cultural expressions
+    prefix = CULTURAL_RESPONSE_PREFIXES.get(emotional_tone, DEFAULT_CULTURAL_RESPONSE_PREFIX)
+    return f"{prefix}{response}"
 
 
 class BaseTool(ABC):
@@ -21,6 +190,19 @@ class BaseTool(ABC):
     - Standardized tool interface
     """
     
+    __slots__ = (
+        "rtvi_processor",
+        "task",
+        "tool_name",
+        "clinical_data",
+        "_crisis_detected",
+        "_emergency_escalation_needed",
+        "_professional_referral_suggested",
+        "_clinical_context",
+        "session_clinical_log",
+        "_clinical_log_count",
+    )
+    
     def __init__(self, rtvi_processor, task=None):
         """
         Initialize base therapeutic tool.
@@ -34,6 +216,13 @@ class BaseTool(ABC):
         self.tool_name = self.__class__.__name__.lower().replace('tool', '')
         self.clinical_data = {}
         
+        # Cached result of _get_clinical_context, reset whenever a safety flag changes
+        self._clinical_context = None
+        
+        # Session clinical log (bounded to the latest entries) and total actions logged
+        self.session_clinical_log = deque(maxlen=CLINICAL_LOG_CAPACITY)
+        self._clinical_log_count = 0
+        
         # Clinical safety flags
         self.crisis_detected = False
         self.emergency_escalation_needed = False
@@ -41,11 +230,41 @@ class BaseTool(ABC):
         
         logger.info(f"🏥 Initialized therapeutic tool: {self.tool_name}")
     
+    @property
+    def crisis_detected(self) -> bool:
+        return self._crisis_detected
+    
+    @crisis_detected.setter
+    def crisis_detected(self, value: bool):
+        self._crisis_detected = value
+        self._clinical_context = None
+    
+    @property
+    def emergency_escalation_needed(self) -> bool:
+        return self._emergency_escalation_needed
+    
+    @emergency_escalation_needed.setter
+    def emergency_escalation_needed(self, value: bool):
+        self._emergency_escalation_needed = value
+        self._clinical_context = None
+    
+    @property
+    def professional_referral_suggested(self) -> bool:
+        return self._professional_referral_suggested
+    
+    @professional_referral_suggested.setter
+    def professional_referral_suggested(self, value: bool):
+        self._professional_referral_suggested = value
+        self._clinical_context = None
+    
     @abstractmethod
     def get_tool_definition(self) -> FunctionSchema:
         """
         Define the tool schema for LLM function calling.
         Must be implemented by each therapeutic tool.
+        
+        Called on every function-calling turn, so implementations should return
+        a schema built once (e.g. a module-level constant) rather than a new one.
         """
         pass
     
@@ -73,30 +292,38 @@ class BaseTool(ABC):
             return False
         return True
     
-    async def send_client_command(self, command_type: str, data: Dict[Any, Any]):
+    async def send_client_command(self, command_type: str, data: Dict[Any, Any], clinical_context: Optional[Dict[str, Any]] = None):
         """
         Send command to client via WebSocket for UI updates with automatic cleanup.
         
+        Routine commands are queued and coalesced with others sent in the same
+        flush window; crisis and emergency commands are broadcast immediately,
+        right after any commands already queued.
+        
         Args:
             command_type: Type of command to send
             data: Command data payload
+            clinical_context: Clinical context already built by the caller, if any
         """
         try:
-            from utils.tool_websocket_registry import broadcast_to_all_therapeutic_clients
-            
             command = {
                 "type": f"therapeutic_{command_type}",
                 "tool": self.tool_name,
                 "data": data,
                 "timestamp": self._get_timestamp(),
-                "clinical_context": self._get_clinical_context()
+                "clinical_context": clinical_context if clinical_context is not None else self._get_clinical_context()
             }
             
-            # Use the enhanced broadcast function with automatic cleanup
-            sent_count = await broadcast_to_all_therapeutic_clients(command)
+            if command_type not in PRIORITY_CLIENT_COMMANDS:
+                queue_therapeutic_broadcast(command)
+                logger.debug("🏥 Therapeutic command '{}' queued for broadcast", command_type)
+                return
+            
+            # Skip the flush window, but keep the order commands were sent in
+            sent_count = await broadcast_therapeutic_command_now(command)
             
             if sent_count > 0:
-                logger.debug(f"🏥 Therapeutic command '{command_type}' sent to {sent_count} clients")
+                logger.debug("🏥 Therapeutic command '{}' sent to {} clients", command_type, sent_count)
             else:
                 logger.warning(f"🏥 No clients available for therapeutic command '{command_type}'")
         
@@ -105,17 +332,23 @@ class BaseTool(ABC):
     
     def _get_timestamp(self) -> str:
         """Get current timestamp for clinical documentation."""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def _get_clinical_context(self) -> Dict[str, Any]:
-        """Get current clinical context for documentation."""
-        return {
-            "crisis_detected": self.crisis_detected,
-            "emergency_escalation": self.emergency_escalation_needed,
-            "referral_suggested": self.professional_referral_suggested,
-            "tool_active": self.tool_name
-        }
+        """
+        Get current clinical context for documentation.
+        
+        The dict is cached until a safety flag changes and is shared between
+        log entries, so callers must not mutate it.
+        """
+        if self._clinical_context is None:
+            self._clinical_context = {
+                "crisis_detected": self._crisis_detected,
+                "emergency_escalation": self._emergency_escalation_needed,
+                "referral_suggested": self._professional_referral_suggested,
+                "tool_active": self.tool_name
+            }
+        return self._clinical_context
     
     async def log_clinical_action(self, action: str, details: Dict[str, Any]):
         """
@@ -131,50 +364,40 @@ class BaseTool(ABC):
             "action": action,
             "details": details,
             "clinical_context": self._get_clinical_context(),
-            "session_metadata": {
-                "tool_version": "1.0.0",
-                "cultural_adaptations": "omani_gulf_arabic",
-                "therapeutic_approach": "culturally_integrated_therapy",
-                "safety_protocols_active": True
-            }
+            "session_metadata": SESSION_METADATA
         }
         
         # Store in clinical data for session documentation
-        if not hasattr(self, 'session_clinical_log'):
-            self.session_clinical_log = []
+        self._clinical_log_count += 1
+        clinical_log["seq"] = self._clinical_log_count
         self.session_clinical_log.append(clinical_log)
         
-        logger.info(f"🏥 Clinical action logged: {action} by {self.tool_name}")
+        logger.info("🏥 Clinical action logged: {} by {}", action, self.tool_name)
         
-        # Send clinical log to client for documentation
-        await self.send_client_command("clinical_log", clinical_log)
+        # Queue the clinical log with the tool's other client commands so it keeps its place in their order;
+        # routine commands are broadcast by the batch flusher, so tool actions don't wait on client I/O
+        await self.send_client_command("clinical_log", clinical_log, clinical_log["clinical_context"])
         
-        # If this is a crisis-related action, also log to crisis documentation
-        if any(keyword in action.lower() for keyword in ['crisis', 'emergency', 'risk', 'escalation']):
+        # If this is a crisis-related action, also log to crisis documentation (sent right after the log)
+        if CRISIS_ACTION_PATTERN.search(action):
             await self._log_crisis_documentation(clinical_log)
     
     async def _log_crisis_documentation(self, clinical_log: Dict[str, Any]):
         """Log crisis-related actions with enhanced documentation."""
         crisis_log = {
-            **clinical_log,
-            "crisis_documentation": {
-                "protocol_activated": True,
-                "cultural_considerations": "gulf_arabic_islamic_context",
-                "family_notification_status": "pending_assessment",
-                "emergency_resources_provided": True,
-                "follow_up_required": True
-            }
+            "clinical_log": clinical_log,
+            "crisis_documentation": CRISIS_DOCUMENTATION
         }
         
         logger.critical(f"🚨 CRISIS DOCUMENTATION: {clinical_log['action']}")
-        await self.send_client_command("crisis_documentation", crisis_log)
+        await self.send_client_command("crisis_documentation", crisis_log, clinical_log["clinical_context"])
     
     def get_session_documentation(self) -> Dict[str, Any]:
         """Get comprehensive session documentation for clinical records."""
         return {
             "session_summary": {
                 "tool_name": self.tool_name,
-                "total_actions": len(getattr(self, 'session_clinical_log', [])),
+                "total_actions": self._clinical_log_count,
                 "crisis_flags": {
                     "crisis_detected": self.crisis_detected,
                     "emergency_escalation": self.emergency_escalation_needed,
@@ -182,7 +405,7 @@ class BaseTool(ABC):
                 },
                 "cultural_adaptations": "omani_gulf_arabic_islamic"
             },
-            "clinical_actions": getattr(self, 'session_clinical_log', []),
+            "clinical_actions": list(self.session_clinical_log),
             "safety_assessment": self._get_clinical_context(),
             "recommendations": self._generate_session_recommendations()
         }
@@ -192,24 +415,16 @@ class BaseTool(ABC):
         recommendations = []
         
         if self.crisis_detected:
-            recommendations.append("Continue crisis monitoring and safety assessment")
-            recommendations.append("Ensure 24-hour safety plan is in place")
-            recommendations.append("Consider family involvement per cultural preferences")
+            recommendations.extend(CRISIS_RECOMMENDATIONS)
         
         if self.emergency_escalation_needed:
-            recommendations.append("Immediate professional intervention required")
-            recommendations.append("Coordinate with local mental health services")
-            recommendations.append("Provide emergency contact information")
+            recommendations.extend(ESCALATION_RECOMMENDATIONS)
         
         if self.professional_referral_suggested:
-            recommendations.append("Schedule follow-up with licensed mental health professional")
-            recommendations.append("Provide culturally appropriate referral options")
-            recommendations.append("Ensure continuity of care documentation")
+            recommendations.extend(REFERRAL_RECOMMENDATIONS)
         
         # Always include cultural considerations
-        recommendations.append("Maintain cultural sensitivity in all interventions")
-        recommendations.append("Respect Islamic values and Gulf Arab customs")
-        recommendations.append("Consider family dynamics in treatment planning")
+        recommendations.extend(CULTURAL_RECOMMENDATIONS)
         
         return recommendations
     
@@ -240,16 +455,12 @@ class BaseTool(ABC):
             "recommendations": []
         }
         
-        # Check for potential cultural sensitivity issues
-        content_lower = content.lower()
-        
-        # Religious sensitivity
-        if any(word in content_lower for word in ["haram", "forbidden", "sin"]):
-            sensitive_indicators["recommendations"].append("Consider religious context sensitivity")
+        # Check for religious and cultural terminology in a single pass
+        matched_groups = {match.lastgroup for match in CULTURAL_SENSITIVITY_PATTERN.finditer(content)}
         
-        # Cultural terminology
-        if any(word in content_lower for word in ["family", "marriage", "honor"]):
-            sensitive_indicators["recommendations"].append("Apply Gulf cultural context")
+        for group, recommendation in CULTURAL_SENSITIVITY_RECOMMENDATIONS:
+            if group in matched_groups:
+                sensitive_indicators["recommendations"].append(recommendation)
         
         return sensitive_indicators
     
@@ -267,42 +478,16 @@ class BaseTool(ABC):
         if not user_input:
             return False
         
-        crisis_keywords = [
-            # English direct indicators
-            "suicide", "kill myself", "end it all", "no point living", "hurt myself",
-            "overdose", "jump", "cut myself", "die", "death", "can't go on",
-            "better off dead", "want to disappear", "end my life", "not worth living",
-            
-            # Arabic direct indicators (العربية المباشرة)
-            "انتحار", "اقتل نفسي", "لا يوجد امل", "اؤذي نفسي", "اموت", 
-            "جرعة زائدة", "اقفز", "اجرح نفسي", "لا استطيع المتابعة", "اريد ان اختفي",
-            "انهي حياتي", "لا استحق الحياة", "تعبت من الحياة", "ما فيه فايدة",
-            
-            # Gulf Arabic expressions of extreme distress
-            "خلاص تعبت", "ما عاد فيني", "انطفيت", "مليت من الحياة", 
-            "ودي اروح", "تعبت من كل شي", "ما اقدر اكمل", "خلاص كفيت",
-            "حياتي ما لها معنى", "مو قادر", "تعبان نفسياً مره",
-            
-            # Cultural expressions of hopelessness
-            "الله يا خذني", "ريحني يا رب", "تعبت يا رب", "ما عاد لي صبر",
-            "يا ليتني ما انولدت", "ودي الموت", "الموت ارحم",
-            
-            # Omani/Gulf cultural distress expressions
-            "ما عاد عندي امل", "خلاص انكسرت", "روحي تعبانة", "قلبي مات",
-            "ما اقدر احتمل", "مو قادر على شي", "نفسيتي خربت خلاص"
-        ]
-        
-        user_lower = user_input.lower()
-        for keyword in crisis_keywords:
-            if keyword in user_lower:
-                self.crisis_detected = True
-                await self.log_clinical_action("crisis_indicator_detected", {
-                    "keyword": keyword,
-                    "user_input_length": len(user_input),
-                    "immediate_action": "crisis_protocol_activated",
-                    "cultural_context": "gulf_arabic_expression" if any(arabic_char in keyword for arabic_char in "ابتثجحخدذرزسشصضطظعغفقكلمنهوي") else "english_expression"
-                })
-                return True
+        keyword = find_crisis_keyword(user_input.lower())
+        if keyword is not None:
+            self.crisis_detected = True
+            await self.log_clinical_action("crisis_indicator_detected", {
+                "keyword": keyword,
+                "user_input_length": len(user_input),
+                "immediate_action": "crisis_protocol_activated",
+                "cultural_context": "gulf_arabic_expression" if keyword in ARABIC_CRISIS_KEYWORDS else "english_expression"
+            })
+            return True
         
         return False
     
@@ -341,20 +526,7 @@ class BaseTool(ABC):
         """
         self.professional_referral_suggested = True
         
-        # Culturally sensitive referral message in Arabic and English
-        referral_message = f"""
-        أعتقد أنه من المفيد لك التحدث مع معالج نفسي مختص. هذا أمر طبيعي وإيجابي.
-        
-        I believe it would be beneficial for you to speak with a licensed mental health professional. This is a normal and positive step.
-        
-        السبب: {reason}
-        Reason: {reason}
-        
-        يمكنني مساعدتك في العثور على معالج يفهم ثقافتنا العربية.
-        I can help you find a therapist who understands our Arab culture.
-        """
-        
-        return referral_message
+        return REFERRAL_MESSAGE_TEMPLATE.format(reason=reason)
     
     def format_response_culturally(self, response: str, emotional_tone: str = "supportive") -> str:
         """
@@ -367,12 +539,4 @@ class BaseTool(ABC):
         Returns:
             Culturally formatted response
         """
-        # Add appropriate Arabic greetings and cultural expressions
-        if emotional_tone == "supportive":
-            prefix = "الله يعطيك القوة، "  # "May Allah give you strength"
-        elif emotional_tone == "encouraging":
-            prefix = "إن شاء الله كل شيء سيكون بخير، "  # "God willing, everything will be fine"
-        else:
-            prefix = "أفهم مشاعرك، "  # "I understand your feelings"
-        
-        return f"{prefix}{response}" 
\ No newline at end of file
+        return format_cultural_response(response, emotional_tone) 
\ No newline at end of file
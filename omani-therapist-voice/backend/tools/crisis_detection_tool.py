@@ -4,10 +4,386 @@ Monitors for suicide risk, self-harm, and mental health emergencies.
 """
 
 import re
-from typing import Dict, Any, List
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 from loguru import logger
 from pipecat.adapters.schemas.function_schema import FunctionSchema
-from .base_tool import BaseTool
+from .base_tool import AHOCORASICK_AVAILABLE, AhoCorasick, BaseTool, format_cultural_response
+
+# Arabic spelling variants folded to one form: hamza/madda alefs to bare alef, alef maqsura to ya,
+# ta marbuta to ha; tashkeel, superscript alef, tatweel and zero-width non-joiners are dropped
+ARABIC_NORMALIZATION_TABLE = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي",
+    "ة": "ه",
+    **dict.fromkeys("\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652\u0670\u0640\u200c")
+})
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Fold Arabic spelling variants and strip diacritics so keywords match however the user typed them.
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        Normalized text; non-Arabic characters are left unchanged
+    """
+    return text.translate(ARABIC_NORMALIZATION_TABLE)
+
+
+class CategoryKeywordMatcher:
+    """
+    Find which keyword categories occur in text.
+    
+    English keywords match whole words case-insensitively and Arabic keywords
+    match anywhere after normalize_arabic() is applied to both keyword and text;
+    whitespace inside a keyword matches any run of whitespace.
+    All keywords are scanned in a single Aho-Corasick pass when ahocorasick_rs
+    is installed, otherwise with one compiled regex per category.
+    """
+    
+    def __init__(self, keywords: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]]):
+        """
+        Build the matcher.
+        
+        Args:
+            keywords: Category -> (English keywords, Arabic keywords), in reporting order
+            
+        Raises:
+            ValueError: If a category has no keywords
+        """
+        self.categories = tuple(keywords)
+        if not all(english or arabic for english, arabic in keywords.values()):
+            raise ValueError("every category needs at least one keyword")
+        keywords = {
+            category: (english, tuple(map(normalize_arabic, arabic)))
+            for category, (english, arabic) in keywords.items()
+        }
+        
+        # Inputs shorter than every keyword (empty or filler transcript fragments) cannot match
+        self.min_keyword_length = min(
+            len(keyword) for english, arabic in keywords.values() for keyword in english + arabic
+        )
+        
+        # Regex fallback: per category, a case-insensitive whole-word English union and an uncased Arabic union;
+        # None for an empty keyword tuple, whose empty union would match every input
+        self._patterns = {
+            category: (
+                re.compile(rf"\b(?:{'|'.join(map(_keyword_regex, english))})\b", re.IGNORECASE) if english else None,
+                re.compile("|".join(map(_keyword_regex, arabic))) if arabic else None
+            )
+            for category, (english, arabic) in keywords.items()
+        }
+        
+        # Aho-Corasick automaton over every keyword, with its category and whether it needs word boundaries
+        patterns = []
+        self._pattern_categories = []
+        self._pattern_whole_word = []
+        for category, (english, arabic) in keywords.items():
+            for keyword in english:
+                patterns.append(keyword.lower())
+                self._pattern_categories.append(category)
+                self._pattern_whole_word.append(True)
+            for keyword in arabic:
+                patterns.append(keyword)
+                self._pattern_categories.append(category)
+                self._pattern_whole_word.append(False)
+        self._automaton = AhoCorasick(patterns) if AHOCORASICK_AVAILABLE else None
+    
+    def find_categories(self, text: str) -> List[str]:
+        """
+        Find the categories with at least one keyword in text.
+        
+        Args:
+            text: User input
+            
+        Returns:
+            Matched categories, in reporting order
+        """
+        if len(text.strip()) < self.min_keyword_length:
+            return []
+        
+        text = normalize_arabic(text)
+        if self._automaton is None:
+            return [
+                category for category, (english_pattern, arabic_pattern) in self._patterns.items()
+                if (english_pattern is not None and english_pattern.search(text))
+                or (arabic_pattern is not None and arabic_pattern.search(text))
+            ]
+        
+        text = " ".join(text.lower().split())
+        matched = set()
+        for pattern_index, start, end in self._automaton.find_matches_as_indexes(text, overlapping=True):
+            if self._pattern_whole_word[pattern_index] and not _is_whole_word(text, start, end):
+                continue
+            matched.add(self._pattern_categories[pattern_index])
+        return [category for category in self.categories if category in matched]
+
+
+def _keyword_regex(keyword: str) -> str:
+    """Escape a keyword for regex use, letting its spaces match any whitespace."""
+    return re.escape(keyword).replace(r"\ ", r"\s+")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is not part of a longer word (regex \\b on both sides)."""
+    return (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end]))
+
+
+# Arabic and English crisis keywords by indicator category
+CRISIS_INDICATOR_MATCHER = CategoryKeywordMatcher({
+    "suicidal_ideation": (
+        ("suicide", "kill myself", "end it all", "no point living"),
+        ("انتحار", "اقتل نفسي", "انهي حياتي", "لا يوجد أمل")
+    ),
+    "self_harm": (
+        ("cut myself", "hurt myself", "self harm", "overdose"),
+        ("اجرح نفسي", "اؤذي نفسي", "جرعة زائدة")
+    ),
+    "hopelessness": (
+        ("hopeless", "nothing matters", "give up", "no future"),
+        ("لا أمل", "لا يهم شيء", "استسلم", "لا مستقبل")
+    ),
+    "isolation": (
+        ("nobody cares", "all alone", "no friends", "isolated"),
+        ("لا يهتم أحد", "وحيد", "لا أصدقاء", "معزول")
+    )
+})
+
+# Recent utterances whose crisis indicators have already been scanned
+CRISIS_SCAN_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=CRISIS_SCAN_CACHE_SIZE)
+def detect_crisis_indicators(text: str) -> Tuple[str, ...]:
+    """
+    Find the crisis indicator categories present in an utterance.
+    
+    Cached so repeated crisis actions on the same turn scan the text only once.
+    
+    Args:
+        text: User input
+        
+    Returns:
+        Detected indicator categories, in reporting order
+    """
+    return tuple(CRISIS_INDICATOR_MATCHER.find_categories(text))
+
+
+# Emotional state keywords by emotion
+EMOTIONAL_STATE_MATCHER = CategoryKeywordMatcher({
+    "despair": (("hopeless", "despair", "worthless", "pointless"), ("يأس", "لا قيمة", "لا فائدة")),
+    "anger": (("angry", "mad", "furious", "rage"), ("غاضب", "متضايق", "غضب")),
+    "sadness": (("sad", "depressed", "down", "empty"), ("حزين", "مكتئب", "فارغ")),
+    "fear": (("scared", "afraid", "terrified", "anxious"), ("خائف", "قلق", "مرعوب")),
+    "numbness": (("numb", "empty", "nothing", "void"), ("مخدر", "فارغ", "لا شيء"))
+})
+
+# Emotions that need immediate attention during crisis support
+URGENT_EMOTIONS = frozenset({"despair", "numbness"})
+
+
+# Crisis action -> (handler method, execute() arguments it takes), in the order advertised to the LLM
+CRISIS_ACTION_HANDLERS = {
+    "assess_risk": ("_assess_suicide_risk", ("user_input", "risk_factors")),
+    "monitor_indicators": ("_monitor_crisis_indicators", ("user_input",)),
+    "create_safety_plan": ("_create_safety_plan", ("cultural_context",)),
+    "escalate_emergency": ("_escalate_emergency", ("urgency_level", "risk_factors")),
+    "provide_immediate_support": ("_provide_immediate_support", ("user_input", "cultural_context")),
+    "activate_cultural_protocols": ("_activate_cultural_protocols", ("cultural_context",))
+}
+CRISIS_ACTIONS = tuple(CRISIS_ACTION_HANDLERS)
+INVALID_CRISIS_ACTION_MESSAGE = f"Invalid crisis action. Use: {', '.join(CRISIS_ACTIONS)}"
+
+# Risk factor -> suicide risk score weight
+RISK_FACTOR_WEIGHTS = {
+    **dict.fromkeys((
+        "previous_attempts", "substance_abuse", "social_isolation",
+        "recent_loss", "access_to_means", "specific_plan"
+    ), 3),
+    **dict.fromkeys((
+        "hopelessness", "depression", "anxiety", "family_conflict",
+        "financial_stress", "health_problems"
+    ), 1)
+}
+
+# Bilingual emergency message with Omani emergency contacts, shown whenever a crisis is escalated
+EMERGENCY_MESSAGE = """
+        🚨 EMERGENCY PROTOCOL ACTIVATED 🚨
+        
+        الله معك في هذه اللحظة الصعبة. أنت لست وحدك، حبيبي/حبيبتي.
+        Allah is with you in this difficult moment. You are not alone, dear.
+        
+        اتصل فوراً بـ:
+        Call immediately:
+        
+        📞 Emergency Services: 999 (الطوارئ العمانية)
+        📞 Royal Oman Police: 9999 (شرطة عمان السلطانية)  
+        📞 Mental Health Services: Ministry of Health Oman
+        📞 Trusted family member or close friend (فرد من العائلة أو صديق مقرب)
+        📞 Local mosque imam for spiritual support (إمام المسجد للدعم الروحي)
+        
+        طلب المساعدة ليس عيباً، بل علامة قوة وحكمة، كما علمنا ديننا الحنيف.
+        Seeking help is not shameful, but a sign of strength and wisdom, as our religion teaches us.
+        
+        الرسول (صلى الله عليه وسلم) قال: "من فرج عن مؤمن كربة فرج الله عنه كربة من كرب يوم القيامة"
+        The Prophet (peace be upon him) said: "Whoever relieves a believer's distress, Allah will relieve their distress."
+        """
+EMERGENCY_IMMEDIATE_ACTIONS = (
+    "Call emergency services if in immediate danger",
+    "Go to nearest emergency room",
+    "Call trusted family member",
+    "Do not be alone"
+)
+
+# Safety plan building blocks
+SAFETY_PLAN_WARNING_SIGNS = (
+    "Feeling overwhelmed",
+    "Thoughts of hopelessness",
+    "Strong urges to harm oneself"
+)
+RELIGIOUS_COPING_STRATEGIES = (
+    "Prayer and dhikr (remembrance of Allah)",
+    "Reading Quran for comfort",
+    "Seeking guidance from religious counsel"
+)
+GENERAL_COPING_STRATEGIES = (
+    "Deep breathing exercises",
+    "Call a trusted family member",
+    "Go to a public place",
+    "Listen to calming music"
+)
+FAMILY_SUPPORT_CONTACTS = (
+    "Immediate family members",
+    "Extended family elders",
+    "Close family friends"
+)
+# Professional resources in Gulf Arabic context
+PROFESSIONAL_RESOURCES = (
+    "Mental health hotline: [Local emergency number]",
+    "Nearest hospital emergency room",
+    "Culturally sensitive therapist",
+    "Community mental health center"
+)
+ENVIRONMENTAL_SAFETY_MEASURES = (
+    "Remove access to harmful objects",
+    "Stay with trusted family/friends",
+    "Avoid isolation",
+    "Create calming environment"
+)
+
+# (religious beliefs, supportive family) -> safety plan; shared and never mutated
+SAFETY_PLANS = {
+    (religious, family_supportive): {
+        "warning_signs": SAFETY_PLAN_WARNING_SIGNS,
+        "coping_strategies": (RELIGIOUS_COPING_STRATEGIES if religious else ()) + GENERAL_COPING_STRATEGIES,
+        "support_contacts": FAMILY_SUPPORT_CONTACTS if family_supportive else (),
+        "professional_resources": PROFESSIONAL_RESOURCES,
+        "environmental_safety": ENVIRONMENTAL_SAFETY_MEASURES
+    }
+    for religious in (False, True)
+    for family_supportive in (False, True)
+}
+
+# Canned responses, formatted once at import
+RISK_ASSESSMENT_RESPONSES = {
+    risk_level: format_cultural_response(
+        f"Risk assessment completed. Risk level: {risk_level}. "
+        f"{'Immediate intervention protocols activated.' if risk_level in ('high', 'imminent') else 'Monitoring and support initiated.'}"
+    )
+    for risk_level in ("low", "moderate", "high", "imminent")
+}
+SAFETY_PLAN_CREATED_RESPONSE = format_cultural_response(
+    "Safety plan created with your cultural and family context in mind. "
+    "This plan will help you stay safe during difficult moments. "
+    "Keep important contact numbers easily accessible.",
+    "encouraging"
+)
+IMMEDIATE_SUPPORT_OPENING = format_cultural_response(
+    "I can hear that you're going through a very difficult time right now. "
+    "Your feelings are valid, and you deserve support and care.",
+    "supportive"
+)
+
+# Islamic comfort added to immediate support for religious users
+ISLAMIC_COMFORT_MESSAGE = (
+    "\n\nاللهم اشفه شفاءً لا يغادر سقماً (May Allah grant you complete healing). "
+    "Remember that seeking help is encouraged in Islam, and taking care of your mental health is part of taking care of the trust Allah has given you."
+)
+
+# Immediate coping techniques closing every immediate support message
+IMMEDIATE_COPING_STEPS = (
+    "\n\nLet's try some immediate techniques to help you feel safer right now:"
+    "\n1. Take deep, slow breaths with me"
+    "\n2. Look around and name 5 things you can see"
+    "\n3. Feel your feet on the ground"
+    "\n4. Remember: This feeling will pass"
+)
+IMMEDIATE_COPING_TECHNIQUES = ("breathing", "grounding", "mindfulness")
+
+# (cultural_context key, value that activates it or None for any truthy value, adaptation flag, protocol)
+CULTURAL_PROTOCOLS = (
+    ("family_dynamics", "supportive", "family_involvement", "family_support_integration"),
+    ("religious_beliefs", None, "religious_considerations", "islamic_spiritual_support"),
+    ("social_support", "available", "community_support", "community_resource_activation")
+)
+
+# Static schema, built once and returned on every LLM function-calling turn
+CRISIS_DETECTION_TOOL_DEFINITION = FunctionSchema(
+    name="detect_crisis",
+    description="Monitor and respond to mental health crises, suicide risk, and emergency situations with cultural sensitivity",
+    properties={
+        "action": {
+            "type": "string",
+            "enum": list(CRISIS_ACTIONS),
+            "description": "Crisis detection action to perform"
+        },
+        "user_input": {
+            "type": "string",
+            "description": "User's recent input to analyze for crisis indicators"
+        },
+        "risk_factors": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Identified risk factors (hopelessness, isolation, suicidal ideation, etc.)"
+        },
+        "cultural_context": {
+            "type": "object",
+            "properties": {
+                "family_dynamics": {"type": "string"},
+                "religious_beliefs": {"type": "string"},
+                "social_support": {"type": "string"}
+            },
+            "description": "Cultural context for appropriate intervention"
+        },
+        "urgency_level": {
+            "type": "string",
+            "enum": ["low", "moderate", "high", "imminent"],
+            "description": "Assessed urgency level for intervention"
+        }
+    },
+    required=["action"]
+)
+
+
+@dataclass(frozen=True)
+class RiskAssessmentPayload:
+    """Risk assessment sent to clients; serialized like a dict by encode_therapeutic_command."""
+    
+    # Declared by hand (dataclass(slots=True) needs Python 3.10); fields must not have defaults
+    __slots__ = ("risk_level", "risk_score", "requires_immediate_action")
+    
+    risk_level: str
+    risk_score: int
+    requires_immediate_action: bool
 
 
 class CrisisDetectionTool(BaseTool):
@@ -36,7 +412,7 @@ class CrisisDetectionTool(BaseTool):
         
         # Crisis tracking
         self.current_risk_level = "low"
-        self.crisis_indicators = []
+        self.crisis_indicators = Counter()
         self.safety_plan_created = False
         self.emergency_contacts_available = False
         
@@ -51,58 +427,12 @@ class CrisisDetectionTool(BaseTool):
     
     def get_tool_definition(self) -> FunctionSchema:
         """Define the crisis detection tool for LLM function calling."""
-        return FunctionSchema(
-            name="detect_crisis",
-            description="Monitor and respond to mental health crises, suicide risk, and emergency situations with cultural sensitivity",
-            properties={
-                "action": {
-                    "type": "string",
-                    "enum": [
-                        "assess_risk",
-                        "monitor_indicators", 
-                        "create_safety_plan",
-                        "escalate_emergency",
-                        "provide_immediate_support",
-                        "activate_cultural_protocols"
-                    ],
-                    "description": "Crisis detection action to perform"
-                },
-                "user_input": {
-                    "type": "string",
-                    "description": "User's recent input to analyze for crisis indicators"
-                },
-                "risk_factors": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Identified risk factors (hopelessness, isolation, suicidal ideation, etc.)"
-                },
-                "cultural_context": {
-                    "type": "object",
-                    "properties": {
-                        "family_dynamics": {"type": "string"},
-                        "religious_beliefs": {"type": "string"},
-                        "social_support": {"type": "string"}
-                    },
-                    "description": "Cultural context for appropriate intervention"
-                },
-                "urgency_level": {
-                    "type": "string",
-                    "enum": ["low", "moderate", "high", "imminent"],
-                    "description": "Assessed urgency level for intervention"
-                }
-            },
-            required=["action"]
-        )
+        return CRISIS_DETECTION_TOOL_DEFINITION
     
     async def execute(self, action: str, **kwargs) -> str:
         """Execute crisis detection actions."""
-        valid_actions = [
-            "assess_risk", "monitor_indicators", "create_safety_plan",
-            "escalate_emergency", "provide_immediate_support", "activate_cultural_protocols"
-        ]
-        
-        if not self.validate_action(action, valid_actions):
-            return f"Invalid crisis action. Use: {', '.join(valid_actions)}"
+        if not self.validate_action(action, CRISIS_ACTIONS):
+            return INVALID_CRISIS_ACTION_MESSAGE
         
         user_input = kwargs.get("user_input", "")
         risk_factors = kwargs.get("risk_factors", [])
@@ -117,18 +447,14 @@ class CrisisDetectionTool(BaseTool):
             "cultural_context": cultural_context
         })
         
-        if action == "assess_risk":
-            return await self._assess_suicide_risk(user_input, risk_factors)
-        elif action == "monitor_indicators":
-            return await self._monitor_crisis_indicators(user_input)
-        elif action == "create_safety_plan":
-            return await self._create_safety_plan(cultural_context)
-        elif action == "escalate_emergency":
-            return await self._escalate_emergency(urgency_level, risk_factors)
-        elif action == "provide_immediate_support":
-            return await self._provide_immediate_support(user_input, cultural_context)
-        elif action == "activate_cultural_protocols":
-            return await self._activate_cultural_protocols(cultural_context)
+        action_args = {
+            "user_input": user_input,
+            "risk_factors": risk_factors,
+            "cultural_context": cultural_context,
+            "urgency_level": urgency_level
+        }
+        handler_name, arg_names = CRISIS_ACTION_HANDLERS[action]
+        return await getattr(self, handler_name)(*(action_args[name] for name in arg_names))
     
     async def _assess_suicide_risk(self, user_input: str, risk_factors: List[str]) -> str:
         """Assess suicide risk level based on input and factors."""
@@ -137,22 +463,7 @@ class CrisisDetectionTool(BaseTool):
         crisis_detected = await self.check_crisis_indicators(user_input)
         
         # Analyze risk factors
-        high_risk_factors = [
-            "previous_attempts", "substance_abuse", "social_isolation", 
-            "recent_loss", "access_to_means", "specific_plan"
-        ]
-        
-        moderate_risk_factors = [
-            "hopelessness", "depression", "anxiety", "family_conflict",
-            "financial_stress", "health_problems"
-        ]
-        
-        risk_score = 0
-        for factor in risk_factors:
-            if factor in high_risk_factors:
-                risk_score += 3
-            elif factor in moderate_risk_factors:
-                risk_score += 1
+        risk_score = sum(RISK_FACTOR_WEIGHTS.get(factor, 0) for factor in risk_factors)
         
         # Determine risk level
         if risk_score >= 6 or crisis_detected:
@@ -173,58 +484,30 @@ class CrisisDetectionTool(BaseTool):
         }
         
         # Send risk assessment to client
-        await self.send_client_command("risk_assessment", {
-            "risk_level": self.current_risk_level,
-            "risk_score": risk_score,
-            "requires_immediate_action": self.current_risk_level in ["high", "imminent"]
-        })
+        await self.send_client_command("risk_assessment", RiskAssessmentPayload(
+            risk_level=self.current_risk_level,
+            risk_score=risk_score,
+            requires_immediate_action=self.current_risk_level in ("high", "imminent")
+        ))
         
         # Auto-escalate if imminent risk
         if self.current_risk_level == "imminent":
             await self._escalate_emergency("imminent", risk_factors)
         
-        return self.format_response_culturally(
-            f"Risk assessment completed. Risk level: {self.current_risk_level}. "
-            f"{'Immediate intervention protocols activated.' if self.current_risk_level in ['high', 'imminent'] else 'Monitoring and support initiated.'}"
-        )
+        return RISK_ASSESSMENT_RESPONSES[self.current_risk_level]
     
     async def _monitor_crisis_indicators(self, user_input: str) -> str:
         """Monitor ongoing conversation for crisis indicators."""
         
-        # Arabic and English crisis keywords
-        crisis_patterns = {
-            "suicidal_ideation": [
-                r"(?i)\b(suicide|kill\s+myself|end\s+it\s+all|no\s+point\s+living)\b",
-                r"انتحار|اقتل\s+نفسي|انهي\s+حياتي|لا\s+يوجد\s+أمل"
-            ],
-            "self_harm": [
-                r"(?i)\b(cut\s+myself|hurt\s+myself|self\s+harm|overdose)\b",
-                r"اجرح\s+نفسي|اؤذي\s+نفسي|جرعة\s+زائدة"
-            ],
-            "hopelessness": [
-                r"(?i)\b(hopeless|nothing\s+matters|give\s+up|no\s+future)\b",
-                r"لا\s+أمل|لا\s+يهم\s+شيء|استسلم|لا\s+مستقبل"
-            ],
-            "isolation": [
-                r"(?i)\b(nobody\s+cares|all\s+alone|no\s+friends|isolated)\b",
-                r"لا\s+يهتم\s+أحد|وحيد|لا\s+أصدقاء|معزول"
-            ]
-        }
-        
-        detected_indicators = []
-        for category, patterns in crisis_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, user_input):
-                    detected_indicators.append(category)
-                    break
+        detected_indicators = detect_crisis_indicators(user_input)
         
         if detected_indicators:
-            self.crisis_indicators.extend(detected_indicators)
+            self.crisis_indicators.update(detected_indicators)
             self.crisis_detected = True
             
             await self.send_client_command("crisis_indicators_detected", {
                 "indicators": detected_indicators,
-                "total_indicators": len(self.crisis_indicators),
+                "total_indicators": sum(self.crisis_indicators.values()),
                 "alert_level": "high" if len(detected_indicators) > 1 else "moderate"
             })
             
@@ -239,56 +522,11 @@ class CrisisDetectionTool(BaseTool):
     async def _create_safety_plan(self, cultural_context: Dict[str, Any]) -> str:
         """Create a culturally appropriate safety plan."""
         
-        safety_plan = {
-            "warning_signs": [
-                "Feeling overwhelmed",
-                "Thoughts of hopelessness", 
-                "Strong urges to harm oneself"
-            ],
-            "coping_strategies": [],
-            "support_contacts": [],
-            "professional_resources": [],
-            "environmental_safety": []
-        }
-        
-        # Add culturally appropriate coping strategies
-        if cultural_context.get("religious_beliefs"):
-            safety_plan["coping_strategies"].extend([
-                "Prayer and dhikr (remembrance of Allah)",
-                "Reading Quran for comfort",
-                "Seeking guidance from religious counsel"
-            ])
-        
-        safety_plan["coping_strategies"].extend([
-            "Deep breathing exercises",
-            "Call a trusted family member",
-            "Go to a public place",
-            "Listen to calming music"
-        ])
-        
-        # Family and community support (culturally important)
-        if cultural_context.get("family_dynamics") == "supportive":
-            safety_plan["support_contacts"].extend([
-                "Immediate family members",
-                "Extended family elders",
-                "Close family friends"
-            ])
-        
-        # Professional resources in Gulf Arabic context
-        safety_plan["professional_resources"].extend([
-            "Mental health hotline: [Local emergency number]",
-            "Nearest hospital emergency room",
-            "Culturally sensitive therapist",
-            "Community mental health center"
-        ])
-        
-        # Environmental safety measures
-        safety_plan["environmental_safety"].extend([
-            "Remove access to harmful objects",
-            "Stay with trusted family/friends",
-            "Avoid isolation",
-            "Create calming environment"
-        ])
+        # Plans vary only by faith integration and family support (culturally important)
+        safety_plan = SAFETY_PLANS[
+            bool(cultural_context.get("religious_beliefs")),
+            cultural_context.get("family_dynamics") == "supportive"
+        ]
         
         self.safety_plan_created = True
         self.clinical_data["safety_plan"] = safety_plan
@@ -299,12 +537,7 @@ class CrisisDetectionTool(BaseTool):
             "cultural_adaptations": cultural_context
         })
         
-        return self.format_response_culturally(
-            "Safety plan created with your cultural and family context in mind. "
-            "This plan will help you stay safe during difficult moments. "
-            "Keep important contact numbers easily accessible.",
-            "encouraging"
-        )
+        return SAFETY_PLAN_CREATED_RESPONSE
     
     async def _escalate_emergency(self, urgency_level: str, risk_factors: List[str]) -> str:
         """Escalate to emergency protocols."""
@@ -322,41 +555,13 @@ class CrisisDetectionTool(BaseTool):
             emergency_data
         )
         
-        # Cultural sensitivity in emergency messaging
-        emergency_message = """
-        🚨 EMERGENCY PROTOCOL ACTIVATED 🚨
-        
-        الله معك في هذه اللحظة الصعبة. أنت لست وحدك، حبيبي/حبيبتي.
-        Allah is with you in this difficult moment. You are not alone, dear.
-        
-        اتصل فوراً بـ:
-        Call immediately:
-        
-        📞 Emergency Services: 999 (الطوارئ العمانية)
-        📞 Royal Oman Police: 9999 (شرطة عمان السلطانية)  
-        📞 Mental Health Services: Ministry of Health Oman
-        📞 Trusted family member or close friend (فرد من العائلة أو صديق مقرب)
-        📞 Local mosque imam for spiritual support (إمام المسجد للدعم الروحي)
-        
-        طلب المساعدة ليس عيباً، بل علامة قوة وحكمة، كما علمنا ديننا الحنيف.
-        Seeking help is not shameful, but a sign of strength and wisdom, as our religion teaches us.
-        
-        الرسول (صلى الله عليه وسلم) قال: "من فرج عن مؤمن كربة فرج الله عنه كربة من كرب يوم القيامة"
-        The Prophet (peace be upon him) said: "Whoever relieves a believer's distress, Allah will relieve their distress."
-        """
-        
         await self.send_client_command("emergency_activated", {
             "urgency": urgency_level,
-            "message": emergency_message,
-            "immediate_actions": [
-                "Call emergency services if in immediate danger",
-                "Go to nearest emergency room",
-                "Call trusted family member",
-                "Do not be alone"
-            ]
+            "message": EMERGENCY_MESSAGE,
+            "immediate_actions": EMERGENCY_IMMEDIATE_ACTIONS
         })
         
-        return emergency_message
+        return EMERGENCY_MESSAGE
     
     async def _provide_immediate_support(self, user_input: str, cultural_context: Dict[str, Any]) -> str:
         """Provide immediate crisis support."""
@@ -365,28 +570,19 @@ class CrisisDetectionTool(BaseTool):
         emotional_indicators = self._assess_emotional_state(user_input)
         
         # Provide culturally appropriate immediate support
-        support_message = self.format_response_culturally(
-            "I can hear that you're going through a very difficult time right now. "
-            "Your feelings are valid, and you deserve support and care.",
-            "supportive"
-        )
+        parts = [IMMEDIATE_SUPPORT_OPENING]
         
         # Add Islamic/cultural comfort if appropriate
         if cultural_context.get("religious_beliefs"):
-            support_message += "\n\nاللهم اشفه شفاءً لا يغادر سقماً (May Allah grant you complete healing). "
-            support_message += "Remember that seeking help is encouraged in Islam, and taking care of your mental health is part of taking care of the trust Allah has given you."
+            parts.append(ISLAMIC_COMFORT_MESSAGE)
         
-        # Immediate coping techniques
-        support_message += "\n\nLet's try some immediate techniques to help you feel safer right now:"
-        support_message += "\n1. Take deep, slow breaths with me"
-        support_message += "\n2. Look around and name 5 things you can see"
-        support_message += "\n3. Feel your feet on the ground"
-        support_message += "\n4. Remember: This feeling will pass"
+        parts.append(IMMEDIATE_COPING_STEPS)
+        support_message = "".join(parts)
         
         await self.send_client_command("immediate_support", {
             "emotional_state": emotional_indicators,
             "support_message": support_message,
-            "coping_techniques": ["breathing", "grounding", "mindfulness"]
+            "coping_techniques": IMMEDIATE_COPING_TECHNIQUES
         })
         
         return support_message
@@ -396,20 +592,11 @@ class CrisisDetectionTool(BaseTool):
         
         protocols_activated = []
         
-        # Family involvement protocol
-        if cultural_context.get("family_dynamics") == "supportive":
-            self.cultural_adaptations["family_involvement"] = True
-            protocols_activated.append("family_support_integration")
-        
-        # Religious considerations
-        if cultural_context.get("religious_beliefs"):
-            self.cultural_adaptations["religious_considerations"] = True
-            protocols_activated.append("islamic_spiritual_support")
-        
-        # Community support
-        if cultural_context.get("social_support") == "available":
-            self.cultural_adaptations["community_support"] = True
-            protocols_activated.append("community_resource_activation")
+        for context_key, expected_value, adaptation, protocol in CULTURAL_PROTOCOLS:
+            value = cultural_context.get(context_key)
+            if value and (expected_value is None or value == expected_value):
+                self.cultural_adaptations[adaptation] = True
+                protocols_activated.append(protocol)
         
         await self.send_client_command("cultural_protocols_activated", {
             "protocols": protocols_activated,
@@ -424,23 +611,10 @@ class CrisisDetectionTool(BaseTool):
     def _assess_emotional_state(self, user_input: str) -> Dict[str, Any]:
         """Assess emotional state from user input."""
         
-        emotional_patterns = {
-            "despair": [r"(?i)\b(hopeless|despair|worthless|pointless)\b", r"يأس|لا\s+قيمة|لا\s+فائدة"],
-            "anger": [r"(?i)\b(angry|mad|furious|rage)\b", r"غاضب|متضايق|غضب"],
-            "sadness": [r"(?i)\b(sad|depressed|down|empty)\b", r"حزين|مكتئب|فارغ"],
-            "fear": [r"(?i)\b(scared|afraid|terrified|anxious)\b", r"خائف|قلق|مرعوب"],
-            "numbness": [r"(?i)\b(numb|empty|nothing|void)\b", r"مخدر|فارغ|لا\s+شيء"]
-        }
-        
-        detected_emotions = []
-        for emotion, patterns in emotional_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, user_input):
-                    detected_emotions.append(emotion)
-                    break
+        detected_emotions = EMOTIONAL_STATE_MATCHER.find_categories(user_input)
         
         return {
             "detected_emotions": detected_emotions,
             "intensity": "high" if len(detected_emotions) > 2 else "moderate" if detected_emotions else "low",
-            "requires_immediate_attention": "despair" in detected_emotions or "numbness" in detected_emotions
+            "requires_immediate_attention": not URGENT_EMOTIONS.isdisjoint(detected_emotions)
         } 
\ No newline at end of file
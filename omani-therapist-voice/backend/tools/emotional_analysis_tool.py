@@ -4,10 +4,302 @@ Analyzes emotional states with cultural sensitivity for Gulf Arabic context.
 """
 
 import re
-from typing import Dict, Any, List, Tuple
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, Tuple
 from loguru import logger
 from pipecat.adapters.schemas.function_schema import FunctionSchema
-from .base_tool import BaseTool
+from .base_tool import AHOCORASICK_AVAILABLE, AhoCorasick, BaseTool
+
+# Arabic emotional expressions
+ARABIC_EMOTIONS = {
+    "sadness": ("حزين", "مكتئب", "زعلان", "مهموم", "مغموم"),
+    "anxiety": ("قلقان", "متوتر", "خايف", "مرتبك", "مضطرب"),
+    "anger": ("غاضب", "زعلان", "متضايق", "غضبان", "مستاء"),
+    "happiness": ("فرحان", "مبسوط", "سعيد", "مسرور", "راضي"),
+    "fear": ("خايف", "مرعوب", "متخوف", "قلقان", "مهووس"),
+    "shame": ("خجلان", "محرج", "مكسوف", "نادم", "أسف"),
+    "guilt": ("مذنب", "نادم", "أسف", "محرج", "مكسوف"),
+    "hope": ("متفائل", "راجي", "متوقع خير", "متطلع", "آمل")
+}
+
+# Cultural emotional contexts
+CULTURAL_CONTEXTS = {
+    "family_honor": ("عيب", "حرام", "سمعة", "شرف", "كرامة"),
+    "religious_guilt": ("ذنب", "حرام", "معصية", "تقصير", "استغفار"),
+    "social_pressure": ("ناس", "مجتمع", "أهل", "عائلة", "أقارب"),
+    "spiritual_comfort": ("الله", "دعاء", "صبر", "تسليم", "قدر")
+}
+
+# English emotion words, matched as whole words
+ENGLISH_EMOTION_WORDS = {
+    "sadness": ("sad", "depressed", "down", "blue", "melancholy", "heartbroken"),
+    "anxiety": ("anxious", "worried", "nervous", "stressed", "tense", "panic"),
+    "anger": ("angry", "mad", "furious", "irritated", "annoyed", "rage"),
+    "happiness": ("happy", "joyful", "excited", "elated", "cheerful", "content"),
+    "fear": ("scared", "afraid", "terrified", "frightened", "fearful"),
+    "shame": ("ashamed", "embarrassed", "humiliated", "disgrace"),
+    "guilt": ("guilty", "remorse", "regret", "sorry", "fault"),
+    "hope": ("hopeful", "optimistic", "confident", "positive", "encouraged")
+}
+
+# All English emotions in one pattern; each match's group name is its emotion
+ENGLISH_EMOTION_PATTERN = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<{emotion}>{'|'.join(words)})" for emotion, words in ENGLISH_EMOTION_WORDS.items()
+    ) + r")\b",
+    re.IGNORECASE
+)
+
+# Text-based intensity indicators (lowercase)
+HIGH_INTENSITY_WORDS = (
+    "unbearable", "can't take it", "overwhelming", "desperate", "hopeless",
+    "لا أستطيع", "محتمل", "مدمر", "يائس", "محطم"
+)
+MODERATE_INTENSITY_WORDS = (
+    "difficult", "hard", "struggling", "stressed", "worried",
+    "صعب", "متعب", "قلقان", "مرهق", "متوتر"
+)
+
+# Cultural context analysis keywords
+RELIGIOUS_EXPRESSIONS = ("الله", "إن شاء الله", "الحمد لله", "استغفر الله", "صبر", "قدر")
+FAMILY_WORDS = ("أهل", "عائلة", "والدي", "والدتي", "أخوي", "أختي", "زوج", "أطفال")
+SOCIAL_PRESSURE_WORDS = ("ناس", "مجتمع", "عيب", "حرام", "سمعة", "كلام الناس")
+TRADITIONAL_COPING_WORDS = ("صبر", "دعاء", "صلاة", "قراءة القرآن", "ذكر")
+
+# Voice characteristics (lowercase) by what they indicate
+SAD_TONES = frozenset({"low", "flat", "monotone"})
+ANXIOUS_TONES = frozenset({"high", "tense", "strained"})
+ANGRY_TONES = frozenset({"harsh", "sharp", "aggressive"})
+RAPID_PACES = frozenset({"fast", "rapid", "rushed"})
+SLOW_PACES = frozenset({"slow", "hesitant", "labored"})
+WITHDRAWN_VOLUMES = frozenset({"quiet", "whisper", "low"})
+AGITATED_VOLUMES = frozenset({"loud", "shouting", "raised"})
+
+# Emotions that get validating language and, with religious expressions, faith-based comfort
+DISTRESS_EMOTIONS = frozenset({"sadness", "anxiety", "fear"})
+
+# Emotional states kept for pattern tracking; older states are never read
+EMOTION_PATTERN_WINDOW = 5
+
+
+def index_keywords(keywords_by_category: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Invert a category -> keywords table into keyword -> categories.
+    
+    Args:
+        keywords_by_category: Keywords for each category
+        
+    Returns:
+        Every category each keyword belongs to, in table order
+    """
+    index = {}
+    for category, keywords in keywords_by_category.items():
+        for keyword in keywords:
+            index[keyword] = index.get(keyword, ()) + (category,)
+    return index
+
+
+def categories_for_keywords(keywords: FrozenSet[str], index: Dict[str, Tuple[str, ...]]) -> FrozenSet[str]:
+    """Map found keywords to the categories they indicate."""
+    return frozenset(category for keyword in keywords for category in index.get(keyword, ()))
+
+
+# Keyword -> emotions / cultural contexts it indicates
+ARABIC_EMOTION_INDEX = index_keywords(ARABIC_EMOTIONS)
+CULTURAL_CONTEXT_INDEX = index_keywords(CULTURAL_CONTEXTS)
+
+# Crisis emotional indicators: whole-word English alternatives, then Arabic alternatives
+CRISIS_EMOTIONAL_PATTERNS = {
+    "hopelessness": re.compile(
+        r"\b(no\s+hope|hopeless|pointless|no\s+future|give\s+up)\b"
+        r"|لا\s+أمل|يائس|لا\s+فائدة|لا\s+مستقبل|استسلم",
+        re.IGNORECASE
+    ),
+    "worthlessness": re.compile(
+        r"\b(worthless|useless|burden|no\s+value|waste)\b"
+        r"|لا\s+قيمة|عديم\s+الفائدة|عبء|لا\s+أستحق",
+        re.IGNORECASE
+    ),
+    "overwhelming_pain": re.compile(
+        r"\b(unbearable|can't\s+take|too\s+much|overwhelming)\b"
+        r"|لا\s+أحتمل|أكثر\s+من\s+طاقتي|لا\s+أستطيع|مدمر",
+        re.IGNORECASE
+    ),
+    "isolation": re.compile(
+        r"\b(all\s+alone|nobody\s+cares|no\s+one|isolated)\b"
+        r"|وحيد|لا\s+يهتم\s+أحد|لا\s+أحد|معزول",
+        re.IGNORECASE
+    )
+}
+
+# Number of crisis emotional indicators that makes a crisis severe and triggers the emergency protocol
+SEVERE_CRISIS_SCORE = 3
+
+# Interventions sent with intensity assessments, by crisis level
+INTENSITY_INTERVENTIONS = {
+    "high": (
+        "Immediate crisis intervention",
+        "Safety planning",
+        "Professional referral",
+        "Emergency contacts activation"
+    ),
+    "moderate": (
+        "Enhanced coping techniques",
+        "Increased session frequency",
+        "Support system activation",
+        "Stress reduction techniques"
+    ),
+    "low": (
+        "Standard therapeutic techniques",
+        "Regular monitoring",
+        "Skill building",
+        "Prevention strategies"
+    )
+}
+
+# Immediate actions sent with crisis emotional analyses, by crisis level
+CRISIS_LEVEL_ACTIONS = {
+    "severe": (
+        "Activate emergency protocols",
+        "Ensure immediate safety",
+        "Contact emergency services if needed",
+        "Notify emergency contacts"
+    ),
+    "moderate": (
+        "Implement safety plan",
+        "Increase monitoring",
+        "Activate support system",
+        "Consider professional consultation"
+    ),
+    "low": (
+        "Continue regular support",
+        "Monitor for changes",
+        "Maintain therapeutic relationship",
+        "Document emotional state"
+    )
+}
+
+# Every keyword the text analyzers look for, scanned in a single Aho-Corasick pass
+EMOTION_KEYWORDS = tuple(dict.fromkeys(
+    keyword
+    for keywords in (
+        *ARABIC_EMOTIONS.values(), *CULTURAL_CONTEXTS.values(), HIGH_INTENSITY_WORDS, MODERATE_INTENSITY_WORDS,
+        RELIGIOUS_EXPRESSIONS, FAMILY_WORDS, SOCIAL_PRESSURE_WORDS, TRADITIONAL_COPING_WORDS
+    )
+    for keyword in keywords
+))
+EMOTION_KEYWORD_MATCHER = AhoCorasick(list(EMOTION_KEYWORDS)) if AHOCORASICK_AVAILABLE else None
+
+# Arabic diacritics (tashkeel, combining madda/hamza, superscript alef) and tatweel; the keywords are written without them
+ARABIC_DIACRITICS_TABLE = str.maketrans(
+    "", "", "\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652\u0653\u0654\u0655\u0670\u0640"
+)
+
+
+def strip_arabic_diacritics(text: str) -> str:
+    """Remove Arabic diacritics and tatweel so "حَزين" or "حـزين" matches the keyword "حزين"."""
+    return text.translate(ARABIC_DIACRITICS_TABLE)
+
+
+# Keywords are lowercase English or caseless Arabic, so input without ASCII capitals
+# (e.g. Arabic-only speech) can skip the full-string lowercase pass
+ASCII_UPPERCASE_PATTERN = re.compile("[A-Z]")
+
+# Recent utterances whose scans are kept, so several analyses of one utterance scan it once
+TEXT_SCAN_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=TEXT_SCAN_CACHE_SIZE)
+def find_emotion_keywords(text: str) -> FrozenSet[str]:
+    """
+    Find every emotion keyword present in text, ignoring case and Arabic diacritics.
+    
+    Args:
+        text: User input
+        
+    Returns:
+        Keywords found anywhere in the text, including overlapping ones
+    """
+    text = strip_arabic_diacritics(text)
+    if ASCII_UPPERCASE_PATTERN.search(text):
+        text = text.lower()
+    if EMOTION_KEYWORD_MATCHER is not None:
+        return frozenset(
+            EMOTION_KEYWORDS[keyword_index]
+            for keyword_index, _, _ in EMOTION_KEYWORD_MATCHER.find_matches_as_indexes(text, overlapping=True)
+        )
+    return frozenset(keyword for keyword in EMOTION_KEYWORDS if keyword in text)
+
+
+@lru_cache(maxsize=TEXT_SCAN_CACHE_SIZE)
+def find_english_emotions(text: str) -> FrozenSet[str]:
+    """
+    Find the emotions named by English emotion words in text.
+    
+    Args:
+        text: User input
+        
+    Returns:
+        Emotions with at least one whole-word match
+    """
+    return frozenset(match.lastgroup for match in ENGLISH_EMOTION_PATTERN.finditer(text))
+
+
+# Emotional analysis types, in the order advertised to the LLM
+ANALYSIS_TYPES = (
+    "detect_emotions", "track_patterns", "cultural_context_analysis",
+    "emotional_intensity_assessment", "therapeutic_recommendations",
+    "crisis_emotional_indicators"
+)
+INVALID_ANALYSIS_TYPE_MESSAGE = f"Invalid analysis type. Use: {', '.join(ANALYSIS_TYPES)}"
+
+# Static schema, built once and returned on every LLM function-calling turn
+EMOTIONAL_ANALYSIS_TOOL_DEFINITION = FunctionSchema(
+    name="analyze_emotion",
+    description="Analyze emotional states from speech and text with cultural sensitivity for Gulf Arabic context",
+    properties={
+        "analysis_type": {
+            "type": "string",
+            "enum": list(ANALYSIS_TYPES),
+            "description": "Type of emotional analysis to perform"
+        },
+        "user_input": {
+            "type": "string",
+            "description": "User's speech or text input to analyze"
+        },
+        "voice_features": {
+            "type": "object",
+            "properties": {
+                "tone": {"type": "string"},
+                "pace": {"type": "string"},
+                "volume": {"type": "string"},
+                "pitch_variation": {"type": "string"}
+            },
+            "description": "Voice characteristics for audio emotion analysis"
+        },
+        "cultural_context": {
+            "type": "object",
+            "properties": {
+                "arabic_language_used": {"type": "boolean"},
+                "religious_expressions": {"type": "boolean"},
+                "family_context_mentioned": {"type": "boolean"},
+                "cultural_values_referenced": {"type": "boolean"}
+            },
+            "description": "Cultural context for emotion interpretation"
+        },
+        "session_context": {
+            "type": "object",
+            "properties": {
+                "session_duration": {"type": "integer"},
+                "previous_emotions": {"type": "array", "items": {"type": "string"}},
+                "therapeutic_goal": {"type": "string"}
+            },
+            "description": "Session context for pattern analysis"
+        }
+    },
+    required=["analysis_type", "user_input"]
+)
 
 
 class EmotionalAnalysisTool(BaseTool):
@@ -22,103 +314,30 @@ class EmotionalAnalysisTool(BaseTool):
     - Cultural sensitivity for Islamic emotional expressions
     """
     
+    # Shared keyword tables (module constants)
+    arabic_emotions = ARABIC_EMOTIONS
+    cultural_contexts = CULTURAL_CONTEXTS
+    
     def __init__(self, rtvi_processor, task=None):
         """Initialize emotional analysis tool."""
         super().__init__(rtvi_processor, task)
         
         # Emotion tracking
-        self.emotion_history = []
+        self.emotion_history = deque(maxlen=EMOTION_PATTERN_WINDOW)
         self.current_emotional_state = {}
         self.emotional_patterns = {}
         self.cultural_emotional_markers = {}
         
-        # Arabic emotional expressions
-        self.arabic_emotions = {
-            "sadness": ["حزين", "مكتئب", "زعلان", "مهموم", "مغموم"],
-            "anxiety": ["قلقان", "متوتر", "خايف", "مرتبك", "مضطرب"],
-            "anger": ["غاضب", "زعلان", "متضايق", "غضبان", "مستاء"],
-            "happiness": ["فرحان", "مبسوط", "سعيد", "مسرور", "راضي"],
-            "fear": ["خايف", "مرعوب", "متخوف", "قلقان", "مهووس"],
-            "shame": ["خجلان", "محرج", "مكسوف", "نادم", "أسف"],
-            "guilt": ["مذنب", "نادم", "أسف", "محرج", "مكسوف"],
-            "hope": ["متفائل", "راجي", "متوقع خير", "متطلع", "آمل"]
-        }
-        
-        # Cultural emotional contexts
-        self.cultural_contexts = {
-            "family_honor": ["عيب", "حرام", "سمعة", "شرف", "كرامة"],
-            "religious_guilt": ["ذنب", "حرام", "معصية", "تقصير", "استغفار"],
-            "social_pressure": ["ناس", "مجتمع", "أهل", "عائلة", "أقارب"],
-            "spiritual_comfort": ["الله", "دعاء", "صبر", "تسليم", "قدر"]
-        }
-        
         logger.info("💭 Emotional Analysis Tool initialized")
     
     def get_tool_definition(self) -> FunctionSchema:
         """Define the emotional analysis tool for LLM function calling."""
-        return FunctionSchema(
-            name="analyze_emotion",
-            description="Analyze emotional states from speech and text with cultural sensitivity for Gulf Arabic context",
-            properties={
-                "analysis_type": {
-                    "type": "string",
-                    "enum": [
-                        "detect_emotions",
-                        "track_patterns",
-                        "cultural_context_analysis",
-                        "emotional_intensity_assessment",
-                        "therapeutic_recommendations",
-                        "crisis_emotional_indicators"
-                    ],
-                    "description": "Type of emotional analysis to perform"
-                },
-                "user_input": {
-                    "type": "string",
-                    "description": "User's speech or text input to analyze"
-                },
-                "voice_features": {
-                    "type": "object",
-                    "properties": {
-                        "tone": {"type": "string"},
-                        "pace": {"type": "string"},
-                        "volume": {"type": "string"},
-                        "pitch_variation": {"type": "string"}
-                    },
-                    "description": "Voice characteristics for audio emotion analysis"
-                },
-                "cultural_context": {
-                    "type": "object",
-                    "properties": {
-                        "arabic_language_used": {"type": "boolean"},
-                        "religious_expressions": {"type": "boolean"},
-                        "family_context_mentioned": {"type": "boolean"},
-                        "cultural_values_referenced": {"type": "boolean"}
-                    },
-                    "description": "Cultural context for emotion interpretation"
-                },
-                "session_context": {
-                    "type": "object",
-                    "properties": {
-                        "session_duration": {"type": "integer"},
-                        "previous_emotions": {"type": "array", "items": {"type": "string"}},
-                        "therapeutic_goal": {"type": "string"}
-                    },
-                    "description": "Session context for pattern analysis"
-                }
-            },
-            required=["analysis_type", "user_input"]
-        )
+        return EMOTIONAL_ANALYSIS_TOOL_DEFINITION
     
     async def execute(self, analysis_type: str, **kwargs) -> str:
         """Execute emotional analysis."""
-        valid_types = [
-            "detect_emotions", "track_patterns", "cultural_context_analysis",
-            "emotional_intensity_assessment", "therapeutic_recommendations",
-            "crisis_emotional_indicators"
-        ]
-        
-        if not self.validate_action(analysis_type, valid_types):
-            return f"Invalid analysis type. Use: {', '.join(valid_types)}"
+        if not self.validate_action(analysis_type, ANALYSIS_TYPES):
+            return INVALID_ANALYSIS_TYPE_MESSAGE
         
         user_input = kwargs.get("user_input", "")
         voice_features = kwargs.get("voice_features", {})
@@ -207,46 +426,27 @@ class EmotionalAnalysisTool(BaseTool):
                 "cultural_markers": []
             }
         
-        text_lower = text.lower()
+        keyword_hits = find_emotion_keywords(text)
         detected_emotions = {
             "primary": [],
             "secondary": [],
             "cultural_markers": []
         }
         
-        # Check for Arabic emotional expressions
-        for emotion, expressions in self.arabic_emotions.items():
-            for expression in expressions:
-                if expression in text_lower or expression in text:
-                    detected_emotions["primary"].append(emotion)
-                    break
-        
-        # Check for cultural emotional contexts
-        for context, markers in self.cultural_contexts.items():
-            for marker in markers:
-                if marker in text_lower or marker in text:
-                    detected_emotions["cultural_markers"].append(context)
-                    break
+        # Check for Arabic emotional expressions and cultural emotional contexts
+        arabic_emotions = categories_for_keywords(keyword_hits, ARABIC_EMOTION_INDEX)
+        cultural_markers = categories_for_keywords(keyword_hits, CULTURAL_CONTEXT_INDEX)
+        detected_emotions["primary"].extend(emotion for emotion in ARABIC_EMOTIONS if emotion in arabic_emotions)
+        detected_emotions["cultural_markers"].extend(context for context in CULTURAL_CONTEXTS if context in cultural_markers)
         
         # English emotion detection
-        english_patterns = {
-            "sadness": r"(?i)\b(sad|depressed|down|blue|melancholy|heartbroken)\b",
-            "anxiety": r"(?i)\b(anxious|worried|nervous|stressed|tense|panic)\b",
-            "anger": r"(?i)\b(angry|mad|furious|irritated|annoyed|rage)\b",
-            "happiness": r"(?i)\b(happy|joyful|excited|elated|cheerful|content)\b",
-            "fear": r"(?i)\b(scared|afraid|terrified|frightened|fearful)\b",
-            "shame": r"(?i)\b(ashamed|embarrassed|humiliated|disgrace)\b",
-            "guilt": r"(?i)\b(guilty|remorse|regret|sorry|fault)\b",
-            "hope": r"(?i)\b(hopeful|optimistic|confident|positive|encouraged)\b"
-        }
+        english_emotions = find_english_emotions(text)
+        for emotion in ENGLISH_EMOTION_WORDS:
+            if emotion in english_emotions and emotion not in detected_emotions["primary"]:
+                detected_emotions["primary"].append(emotion)
         
-        for emotion, pattern in english_patterns.items():
-            if re.search(pattern, text):
-                if emotion not in detected_emotions["primary"]:
-                    detected_emotions["primary"].append(emotion)
-        
-        # Remove duplicates and limit to top emotions
-        detected_emotions["primary"] = list(set(detected_emotions["primary"]))[:3]
+        # Emotions are collected without duplicates; keep the first three in detection order
+        del detected_emotions["primary"][3:]
         
         return detected_emotions
     
@@ -266,28 +466,28 @@ class EmotionalAnalysisTool(BaseTool):
         pitch_variation = voice_features.get("pitch_variation", "").lower()
         
         # Tone analysis
-        if tone in ["low", "flat", "monotone"]:
+        if tone in SAD_TONES:
             voice_emotions["tone_emotion"] = "sadness"
             voice_emotions["intensity_from_voice"] += 2
-        elif tone in ["high", "tense", "strained"]:
+        elif tone in ANXIOUS_TONES:
             voice_emotions["tone_emotion"] = "anxiety"
             voice_emotions["intensity_from_voice"] += 3
-        elif tone in ["harsh", "sharp", "aggressive"]:
+        elif tone in ANGRY_TONES:
             voice_emotions["tone_emotion"] = "anger"
             voice_emotions["intensity_from_voice"] += 3
         
         # Pace analysis
-        if pace in ["fast", "rapid", "rushed"]:
+        if pace in RAPID_PACES:
             voice_emotions["stress_indicators"].append("rapid_speech")
             voice_emotions["intensity_from_voice"] += 1
-        elif pace in ["slow", "hesitant", "labored"]:
+        elif pace in SLOW_PACES:
             voice_emotions["stress_indicators"].append("slow_speech")
             voice_emotions["intensity_from_voice"] += 1
         
         # Volume analysis
-        if volume in ["quiet", "whisper", "low"]:
+        if volume in WITHDRAWN_VOLUMES:
             voice_emotions["stress_indicators"].append("withdrawn_expression")
-        elif volume in ["loud", "shouting", "raised"]:
+        elif volume in AGITATED_VOLUMES:
             voice_emotions["stress_indicators"].append("agitated_expression")
         
         # Cultural voice patterns (specific to Gulf Arabic)
@@ -322,7 +522,7 @@ class EmotionalAnalysisTool(BaseTool):
             )
         
         # Analyze recent emotion history
-        recent_emotions = self.emotion_history[-5:]  # Last 5 emotional states
+        recent_emotions = list(self.emotion_history)
         
         patterns = {
             "dominant_emotions": self._find_dominant_emotions(recent_emotions),
@@ -343,9 +543,9 @@ class EmotionalAnalysisTool(BaseTool):
             dominant = patterns["dominant_emotions"][0]
             response += f"\n\nThe main emotion I'm sensing is {dominant}. "
             
-            if dominant in ["sadness", "anxiety", "fear"]:
+            if dominant in DISTRESS_EMOTIONS:
                 response += "These feelings are completely valid and understandable."
-            elif dominant in ["anger"]:
+            elif dominant == "anger":
                 response += "It's natural to feel this way, and we can work with these feelings constructively."
         
         # Describe progression
@@ -382,28 +582,15 @@ class EmotionalAnalysisTool(BaseTool):
                 "I'm here to support you. Please share your thoughts and feelings when you're ready."
             )
         
-        text_lower = user_input.lower()
+        keyword_hits = find_emotion_keywords(user_input)
         
         # Detect religious expressions
-        religious_expressions = ["الله", "إن شاء الله", "الحمد لله", "استغفر الله", "صبر", "قدر"]
-        for expr in religious_expressions:
-            if expr in user_input:
-                cultural_analysis["religious_expressions"].append(expr)
-        
-        # Family dynamics
-        family_words = ["أهل", "عائلة", "والدي", "والدتي", "أخوي", "أختي", "زوج", "أطفال"]
-        if any(word in user_input for word in family_words):
-            cultural_analysis["family_dynamics_indicated"] = True
-        
-        # Social pressure indicators
-        social_pressure_words = ["ناس", "مجتمع", "عيب", "حرام", "سمعة", "كلام الناس"]
-        if any(word in user_input for word in social_pressure_words):
-            cultural_analysis["social_expectations_pressure"] = True
-        
-        # Traditional coping
-        traditional_coping = ["صبر", "دعاء", "صلاة", "قراءة القرآن", "ذكر"]
-        if any(word in user_input for word in traditional_coping):
-            cultural_analysis["traditional_coping_mentioned"] = True
+        cultural_analysis["religious_expressions"].extend(expr for expr in RELIGIOUS_EXPRESSIONS if expr in keyword_hits)
+        
+        # Family dynamics, social pressure indicators and traditional coping
+        cultural_analysis["family_dynamics_indicated"] = not keyword_hits.isdisjoint(FAMILY_WORDS)
+        cultural_analysis["social_expectations_pressure"] = not keyword_hits.isdisjoint(SOCIAL_PRESSURE_WORDS)
+        cultural_analysis["traditional_coping_mentioned"] = not keyword_hits.isdisjoint(TRADITIONAL_COPING_WORDS)
         
         response = self.format_response_culturally(
             "I appreciate you sharing your feelings in a way that reflects your cultural background. "
@@ -445,22 +632,14 @@ class EmotionalAnalysisTool(BaseTool):
             )
         
         # Text-based intensity indicators
-        high_intensity_words = [
-            "unbearable", "can't take it", "overwhelming", "desperate", "hopeless",
-            "لا أستطيع", "محتمل", "مدمر", "يائس", "محطم"
-        ]
-        
-        moderate_intensity_words = [
-            "difficult", "hard", "struggling", "stressed", "worried",
-            "صعب", "متعب", "قلقان", "مرهق", "متوتر"
-        ]
+        keyword_hits = find_emotion_keywords(user_input)
         
-        for word in high_intensity_words:
-            if word.lower() in user_input.lower():
+        for word in HIGH_INTENSITY_WORDS:
+            if word in keyword_hits:
                 intensity_indicators["text_intensity"] += 3
         
-        for word in moderate_intensity_words:
-            if word.lower() in user_input.lower():
+        for word in MODERATE_INTENSITY_WORDS:
+            if word in keyword_hits:
                 intensity_indicators["text_intensity"] += 1
         
         # Voice-based intensity
@@ -611,35 +790,14 @@ class EmotionalAnalysisTool(BaseTool):
                 "I'm here to support you. Please share your thoughts and feelings when you're ready."
             )
         
-        crisis_emotional_patterns = {
-            "hopelessness": [
-                r"(?i)\b(no\s+hope|hopeless|pointless|no\s+future|give\s+up)\b",
-                r"لا\s+أمل|يائس|لا\s+فائدة|لا\s+مستقبل|استسلم"
-            ],
-            "worthlessness": [
-                r"(?i)\b(worthless|useless|burden|no\s+value|waste)\b",
-                r"لا\s+قيمة|عديم\s+الفائدة|عبء|لا\s+أستحق"
-            ],
-            "overwhelming_pain": [
-                r"(?i)\b(unbearable|can't\s+take|too\s+much|overwhelming)\b",
-                r"لا\s+أحتمل|أكثر\s+من\s+طاقتي|لا\s+أستطيع|مدمر"
-            ],
-            "isolation": [
-                r"(?i)\b(all\s+alone|nobody\s+cares|no\s+one|isolated)\b",
-                r"وحيد|لا\s+يهتم\s+أحد|لا\s+أحد|معزول"
-            ]
-        }
-        
-        detected_indicators = []
-        for indicator, patterns in crisis_emotional_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, user_input):
-                    detected_indicators.append(indicator)
-                    break
+        text = strip_arabic_diacritics(user_input)
+        detected_indicators = [
+            indicator for indicator, pattern in CRISIS_EMOTIONAL_PATTERNS.items() if pattern.search(text)
+        ]
         
         crisis_score = len(detected_indicators)
         
-        if crisis_score >= 3:
+        if crisis_score >= SEVERE_CRISIS_SCORE:
             crisis_level = "severe"
             await self.trigger_emergency_protocol(
                 "Multiple crisis emotional indicators detected",
@@ -772,7 +930,7 @@ class EmotionalAnalysisTool(BaseTool):
         
         # Add cultural comfort if appropriate
         if cultural_context.get("religious_expressions"):
-            if main_emotion in ["sadness", "fear", "anxiety"]:
+            if main_emotion in DISTRESS_EMOTIONS:
                 base_response += " Remember that Allah is with you in this difficulty."
         
         return self.format_response_culturally(base_response, "supportive")
@@ -857,50 +1015,10 @@ class EmotionalAnalysisTool(BaseTool):
         
         return adaptations
     
-    def _get_intensity_interventions(self, crisis_level: str) -> List[str]:
+    def _get_intensity_interventions(self, crisis_level: str) -> Tuple[str, ...]:
         """Get interventions based on intensity level."""
-        if crisis_level == "high":
-            return [
-                "Immediate crisis intervention",
-                "Safety planning",
-                "Professional referral",
-                "Emergency contacts activation"
-            ]
-        elif crisis_level == "moderate":
-            return [
-                "Enhanced coping techniques",
-                "Increased session frequency",
-                "Support system activation",
-                "Stress reduction techniques"
-            ]
-        else:
-            return [
-                "Standard therapeutic techniques",
-                "Regular monitoring",
-                "Skill building",
-                "Prevention strategies"
-            ]
+        return INTENSITY_INTERVENTIONS.get(crisis_level, INTENSITY_INTERVENTIONS["low"])
     
-    def _get_crisis_actions(self, crisis_level: str) -> List[str]:
+    def _get_crisis_actions(self, crisis_level: str) -> Tuple[str, ...]:
         """Get immediate actions for crisis level."""
-        if crisis_level == "severe":
-            return [
-                "Activate emergency protocols",
-                "Ensure immediate safety",
-                "Contact emergency services if needed",
-                "Notify emergency contacts"
-            ]
-        elif crisis_level == "moderate":
-            return [
-                "Implement safety plan",
-                "Increase monitoring",
-                "Activate support system",
-                "Consider professional consultation"
-            ]
-        else:
-            return [
-                "Continue regular support",
-                "Monitor for changes",
-                "Maintain therapeutic relationship",
-                "Document emotional state"
-            ] 
\ No newline at end of file
+        return CRISIS_LEVEL_ACTIONS.get(crisis_level, CRISIS_LEVEL_ACTIONS["low"]) 
\ No newline at end of file
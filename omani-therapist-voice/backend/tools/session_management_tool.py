@@ -10,6 +10,79 @@ from pipecat.adapters.schemas.function_schema import FunctionSchema
 from .base_tool import BaseTool
 
 
+# Static schema, built once and returned on every LLM function-calling turn
+SESSION_MANAGEMENT_TOOL_DEFINITION = FunctionSchema(
+    name="manage_session",
+    description="Manage therapeutic sessions including consent, documentation, privacy, and session flow",
+    properties={
+        "action": {
+            "type": "string",
+            "enum": [
+                "start_session",
+                "end_session",
+                "manage_consent",
+                "update_notes",
+                "set_emergency_contacts",
+                "manage_privacy_settings",
+                "track_therapeutic_goals",
+                "document_progress",
+                "handle_session_interruption",
+                "export_session_summary"
+            ],
+            "description": "Session management action to perform"
+        },
+        "consent_details": {
+            "type": "object",
+            "properties": {
+                "recording_consent": {"type": "boolean"},
+                "data_storage_consent": {"type": "boolean"},
+                "family_involvement_consent": {"type": "boolean"},
+                "emergency_contact_consent": {"type": "boolean"}
+            },
+            "description": "Consent preferences for the session"
+        },
+        "emergency_contacts": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "relationship": {"type": "string"},
+                    "phone": {"type": "string"},
+                    "priority": {"type": "integer"}
+                }
+            },
+            "description": "Emergency contact information"
+        },
+        "cultural_preferences": {
+            "type": "object",
+            "properties": {
+                "preferred_language": {"type": "string"},
+                "religious_considerations": {"type": "boolean"},
+                "family_involvement_preferred": {"type": "boolean"},
+                "gender_preference_therapist": {"type": "string"}
+            },
+            "description": "Cultural and personal preferences"
+        },
+        "therapeutic_goals": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Therapeutic goals for this session or treatment"
+        },
+        "session_notes": {
+            "type": "string",
+            "description": "Clinical notes for the session"
+        },
+        "privacy_level": {
+            "type": "string",
+            "enum": ["minimal", "standard", "high", "maximum"],
+            "description": "Privacy level for the session"
+        }
+    },
+    required=["action"]
+)
+
+
 class SessionManagementTool(BaseTool):
     """
     Session management tool for therapeutic sessions.
@@ -49,76 +122,7 @@ class SessionManagementTool(BaseTool):
     
     def get_tool_definition(self) -> FunctionSchema:
         """Define the session management tool for LLM function calling."""
-        return FunctionSchema(
-            name="manage_session",
-            description="Manage therapeutic sessions including consent, documentation, privacy, and session flow",
-            properties={
-                "action": {
-                    "type": "string",
-                    "enum": [
-                        "start_session",
-                        "end_session",
-                        "manage_consent",
-                        "update_notes",
-                        "set_emergency_contacts",
-                        "manage_privacy_settings",
-                        "track_therapeutic_goals",
-                        "document_progress",
-                        "handle_session_interruption",
-                        "export_session_summary"
-                    ],
-                    "description": "Session management action to perform"
-                },
-                "consent_details": {
-                    "type": "object",
-                    "properties": {
-                        "recording_consent": {"type": "boolean"},
-                        "data_storage_consent": {"type": "boolean"},
-                        "family_involvement_consent": {"type": "boolean"},
-                        "emergency_contact_consent": {"type": "boolean"}
-                    },
-                    "description": "Consent preferences for the session"
-                },
-                "emergency_contacts": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {"type": "string"},
-                            "relationship": {"type": "string"},
-                            "phone": {"type": "string"},
-                            "priority": {"type": "integer"}
-                        }
-                    },
-                    "description": "Emergency contact information"
-                },
-                "cultural_preferences": {
-                    "type": "object",
-                    "properties": {
-                        "preferred_language": {"type": "string"},
-                        "religious_considerations": {"type": "boolean"},
-                        "family_involvement_preferred": {"type": "boolean"},
-                        "gender_preference_therapist": {"type": "string"}
-                    },
-                    "description": "Cultural and personal preferences"
-                },
-                "therapeutic_goals": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Therapeutic goals for this session or treatment"
-                },
-                "session_notes": {
-                    "type": "string",
-                    "description": "Clinical notes for the session"
-                },
-                "privacy_level": {
-                    "type": "string",
-                    "enum": ["minimal", "standard", "high", "maximum"],
-                    "description": "Privacy level for the session"
-                }
-            },
-            required=["action"]
-        )
+        return SESSION_MANAGEMENT_TOOL_DEFINITION
     
     async def execute(self, action: str, **kwargs) -> str:
         """Execute session management actions."""
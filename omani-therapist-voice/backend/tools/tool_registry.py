@@ -3,7 +3,7 @@ Therapeutic Tool Registry for OMANI Therapist Voice.
 Manages dynamic registration and creation of therapeutic tools.
 """
 
-from typing import Dict, List, Type, Optional, Any
+from typing import Dict, List, Type, Optional, Any, Callable
 from loguru import logger
 from .base_tool import BaseTool
 
@@ -20,6 +20,7 @@ class TherapeuticToolRegistry:
         """Initialize the therapeutic tool registry."""
         self._tool_classes: Dict[str, Type[BaseTool]] = {}
         self._active_tools: Dict[str, BaseTool] = {}
+        self._documenting_tools: Dict[str, Callable[[], Dict[str, Any]]] = {}
         self._clinical_metadata: Dict[str, Dict] = {}
         logger.info("🏥 Initialized TherapeuticToolRegistry")
     
@@ -60,6 +61,8 @@ class TherapeuticToolRegistry:
             tool_class = self._tool_classes[tool_name]
             tool_instance = tool_class(rtvi_processor, task)
             self._active_tools[tool_name] = tool_instance
+            if hasattr(tool_instance, 'get_session_documentation'):
+                self._documenting_tools[tool_name] = tool_instance.get_session_documentation
             
             logger.info(f"🏥 Created therapeutic tool instance: {tool_name}")
             return tool_instance
@@ -152,6 +155,15 @@ class TherapeuticToolRegistry:
         
         return clinical_data
     
+    def get_all_session_documentation(self) -> Dict[str, Dict]:
+        """
+        Get session documentation from all active therapeutic tools.
+        
+        Returns:
+            Dictionary mapping tool names to their session documentation
+        """
+        return {tool_name: get_documentation() for tool_name, get_documentation in self._documenting_tools.items()}
+    
     def check_crisis_status(self) -> Dict[str, Any]:
         """
         Check crisis status across all active therapeutic tools.
@@ -201,6 +213,7 @@ class TherapeuticToolRegistry:
         """
         if tool_name in self._active_tools:
             del self._active_tools[tool_name]
+            self._documenting_tools.pop(tool_name, None)
             logger.info(f"🏥 Deactivated therapeutic tool: {tool_name}")
             return True
         return False
@@ -208,6 +221,7 @@ class TherapeuticToolRegistry:
     def deactivate_all_tools(self):
         """Deactivate all active therapeutic tools."""
         self._active_tools.clear()
+        self._documenting_tools.clear()
         logger.info("🏥 Deactivated all therapeutic tools")
     
     def get_tool_stats(self) -> Dict[str, Any]:
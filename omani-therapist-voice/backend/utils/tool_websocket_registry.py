@@ -3,14 +3,47 @@ Tool WebSocket Registry for OMANI Therapist Voice.
 Manages WebSocket connections for real-time tool communication with automatic cleanup.
 """
 
+import asyncio
+import dataclasses
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from fastapi import WebSocket
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Global registry for therapeutic tool WebSocket connections
 tool_websockets: Dict[str, WebSocket] = {}
 
+# Commands queued within this window are coalesced into a single WebSocket frame
+BROADCAST_FLUSH_SECONDS = 0.01
+
+# Pending coalesced commands and the task that flushes them
+_pending_broadcasts: List[Dict[str, Any]] = []
+_broadcast_flush_task: Optional[asyncio.Task] = None
+
+# Serializes queued and immediate broadcasts so clients receive commands in the order they were sent;
+# created on first use so it belongs to the running event loop
+_broadcast_lock: Optional[asyncio.Lock] = None
+
+
+def _encode_dataclass(value: Any) -> Dict[str, Any]:
+    """json.dumps fallback for dataclass payloads (orjson serializes them natively)."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_therapeutic_command(command_data: Dict[str, Any]) -> str:
+    """Serialize a command to JSON text, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(command_data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(command_data, ensure_ascii=False, separators=(",", ":"), default=_encode_dataclass)
+
 
 async def broadcast_to_all_therapeutic_clients(command_data: Dict[str, Any]) -> int:
     """
@@ -20,9 +53,12 @@ async def broadcast_to_all_therapeutic_clients(command_data: Dict[str, Any]) ->
     sent_count = 0
     failed_clients = []
     
-    for client_id, ws in tool_websockets.items():
+    # Encode once and send the same text frame to every client
+    message = encode_therapeutic_command(command_data)
+    
+    for client_id, ws in list(tool_websockets.items()):
         try:
-            await ws.send_json(command_data)
+            await ws.send_text(message)
             sent_count += 1
             logger.debug(f"✅ Therapeutic command sent to tool client {client_id}")
         except Exception as e:
@@ -43,6 +79,68 @@ async def broadcast_to_all_therapeutic_clients(command_data: Dict[str, Any]) ->
     return sent_count
 
 
+def queue_therapeutic_broadcast(command_data: Dict[str, Any]):
+    """
+    Queue a command for a coalesced broadcast to all therapeutic tool clients.
+    Commands queued within BROADCAST_FLUSH_SECONDS are sent together as one
+    'therapeutic_batch' frame; a lone command is sent as-is.
+    """
+    global _broadcast_flush_task
+    
+    _pending_broadcasts.append(command_data)
+    if _broadcast_flush_task is None or _broadcast_flush_task.done():
+        _broadcast_flush_task = asyncio.get_running_loop().create_task(_flush_therapeutic_broadcasts())
+
+
+async def broadcast_therapeutic_command_now(command_data: Dict[str, Any]) -> int:
+    """
+    Broadcast a command without waiting for the flush window.
+    Commands queued before it are sent first, so it never overtakes them.
+    Returns the number of clients that received the command.
+    """
+    async with _get_broadcast_lock():
+        await _send_pending_broadcasts()
+        return await broadcast_to_all_therapeutic_clients(command_data)
+
+
+async def flush_therapeutic_broadcasts():
+    """Send every queued therapeutic command now instead of at the end of the flush window."""
+    async with _get_broadcast_lock():
+        await _send_pending_broadcasts()
+
+
+def _get_broadcast_lock() -> asyncio.Lock:
+    global _broadcast_lock
+    
+    if _broadcast_lock is None:
+        _broadcast_lock = asyncio.Lock()
+    return _broadcast_lock
+
+
+async def _flush_therapeutic_broadcasts():
+    """Drain queued therapeutic commands until no more arrive during a flush window."""
+    while _pending_broadcasts:
+        await asyncio.sleep(BROADCAST_FLUSH_SECONDS)
+        await flush_therapeutic_broadcasts()
+
+
+async def _send_pending_broadcasts():
+    """Send the queued commands as one frame; the caller must hold the broadcast lock."""
+    if not _pending_broadcasts:
+        return
+    
+    batch = _pending_broadcasts.copy()
+    _pending_broadcasts.clear()
+    
+    try:
+        if len(batch) == 1:
+            await broadcast_to_all_therapeutic_clients(batch[0])
+        else:
+            await broadcast_to_all_therapeutic_clients({"type": "therapeutic_batch", "items": batch})
+    except Exception as e:
+        logger.error(f"❌ Error flushing therapeutic broadcast batch: {e}")
+
+
 async def send_to_specific_therapeutic_client(client_id: str, command_data: Dict[str, Any]) -> bool:
     """
     Send a command to a specific therapeutic tool WebSocket client.
@@ -54,7 +152,7 @@ async def send_to_specific_therapeutic_client(client_id: str, command_data: Dict
     
     try:
         ws = tool_websockets[client_id]
-        await ws.send_json(command_data)
+        await ws.send_text(encode_therapeutic_command(command_data))
         logger.info(f"✅ Therapeutic command sent to specific tool client {client_id}")
         return True
     except Exception as e: